@@ -2,14 +2,16 @@
 # Includes pose analysis, person detection, and target tracking
 
 from .pose_analyze import analyze_video, analyze_video_with_anchors, extract_first_frame
-from .detection import detect_persons, auto_select_target
+from .detection import Detections, detect_persons, detect_persons_batched, auto_select_target
 from .tracking import TargetTracker, expand_box
 
 __all__ = [
     'analyze_video',
     'analyze_video_with_anchors',
     'extract_first_frame',
+    'Detections',
     'detect_persons',
+    'detect_persons_batched',
     'auto_select_target',
     'TargetTracker',
     'expand_box'
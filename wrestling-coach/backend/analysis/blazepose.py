@@ -0,0 +1,106 @@
+"""
+BlazePose Landmark Model Helpers for Wrestling Coach
+Pre- and post-processing shared by the pose backends that run the BlazePose
+landmark network directly (TensorRT, ONNX Runtime) instead of through MediaPipe.
+
+The analysis loop already crops the tracked wrestler (YOLO + CSRT), so only
+the landmark stage of BlazePose is needed - the ROI takes the place of the
+pose detector's output. The model is the MediaPipe landmark .tflite exported
+to ONNX (e.g. with tf2onnx) at models/pose_landmark_<variant>.onnx.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Sequence, Tuple
+import cv2
+import numpy as np
+
+from .model_utils import MODELS_DIR
+
+# BlazePose emits 39 landmarks (33 body + 6 auxiliary), 5 values each:
+# x, y, z (input pixels), visibility logit, presence logit
+NUM_OUTPUT_LANDMARKS = 39
+NUM_POSE_LANDMARKS = 33
+LANDMARK_VALUES = 5
+
+# Minimum pose flag score to report a pose (same default as MediaPipe)
+POSE_PRESENCE_THRESHOLD = 0.5
+
+
+@dataclass
+class PoseLandmarkResult:
+    """Minimal stand-in for MediaPipe's PoseLandmarkerResult."""
+    pose_landmarks: List[np.ndarray]
+
+
+def onnx_model_path(model_variant: str) -> Path:
+    return MODELS_DIR / f"pose_landmark_{model_variant}.onnx"
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def letterbox(rgb: np.ndarray, size: int) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+    """
+    Pad-and-resize an RGB ROI into a size x size uint8 canvas.
+    
+    Returns:
+        (canvas, (pad_x, pad_y, new_w, new_h))
+    """
+    h, w = rgb.shape[:2]
+    scale = size / max(h, w)
+    new_w, new_h = max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    
+    canvas = np.zeros((size, size, 3), dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = cv2.resize(rgb, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    return canvas, (pad_x, pad_y, new_w, new_h)
+
+
+def fill_input(out: np.ndarray, rgb: np.ndarray, size: int, nchw: bool) -> Tuple[int, int, int, int]:
+    """Letterbox an RGB ROI into one sample of a float input tensor, scaled to [0, 1]."""
+    canvas, placement = letterbox(rgb, size)
+    image = canvas.transpose(2, 0, 1) if nchw else canvas
+    np.multiply(image, 1.0 / 255.0, out=out, casting="unsafe")
+    return placement
+
+
+def decode_landmarks(
+    outputs: Sequence[np.ndarray],
+    placement: Tuple[int, int, int, int],
+    input_size: int
+) -> PoseLandmarkResult:
+    """
+    Turn one sample's network outputs into ROI-normalized landmarks.
+    
+    Args:
+        outputs: The sample's slice of each output tensor
+        placement: Letterbox placement from fill_input
+        input_size: Side of the square network input
+    
+    Returns:
+        PoseLandmarkResult whose pose_landmarks[0] is a (33, 4) array of
+        x, y, z and visibility, or no poses if the pose flag is too low
+    """
+    pad_x, pad_y, new_w, new_h = placement
+    
+    raw_landmarks = None
+    pose_flag = 1.0
+    for sample in outputs:
+        if sample.size == NUM_OUTPUT_LANDMARKS * LANDMARK_VALUES:
+            raw_landmarks = sample.reshape(NUM_OUTPUT_LANDMARKS, LANDMARK_VALUES)
+        elif sample.size == 1:
+            pose_flag = float(sample.reshape(-1)[0])
+    
+    if raw_landmarks is None or pose_flag < POSE_PRESENCE_THRESHOLD:
+        return PoseLandmarkResult(pose_landmarks=[])
+    
+    body = raw_landmarks[:NUM_POSE_LANDMARKS].astype(np.float64)
+    landmarks = np.empty((NUM_POSE_LANDMARKS, 4), dtype=np.float64)
+    # Undo the letterbox: network pixels -> ROI-normalized coordinates
+    landmarks[:, 0] = (body[:, 0] - pad_x) / new_w
+    landmarks[:, 1] = (body[:, 1] - pad_y) / new_h
+    landmarks[:, 2] = body[:, 2] / input_size
+    landmarks[:, 3] = _sigmoid(body[:, 3])
+    return PoseLandmarkResult(pose_landmarks=[landmarks])
@@ -3,6 +3,14 @@ Person Detection Module for Wrestling Coach
 Uses YOLOv8 for detecting persons in video frames.
 """
 
+import functools
+import math
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import numpy as np
 
@@ -10,26 +18,250 @@ import numpy as np
 from ultralytics import YOLO
 
 
-# Global model instance (lazy loaded)
-_yolo_model: Optional[YOLO] = None
+# Weights and exports live in the backend directory, whatever the working directory
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# PyTorch checkpoint used as the export source
+YOLO_WEIGHTS = str(_BACKEND_DIR / "yolov8n.pt")
+
+# Preferred CPU runtime for inference: "onnx", "openvino", or None for PyTorch
+YOLO_EXPORT_FORMAT: Optional[str] = "onnx"
+
+# Exported artifact path for each supported format
+_EXPORT_PATHS = {
+    "onnx": str(_BACKEND_DIR / "yolov8n.onnx"),
+    "openvino": str(_BACKEND_DIR / "yolov8n_openvino_model"),
+}
+
+# Inference size - we only need coarse person boxes to pick and track a target
+YOLO_IMGSZ = 320
+
+# Max batch the TensorRT engine is built for (matches detect_persons_batched)
+TRT_MAX_BATCH = 16
+
+# Below this many detections auto_select_target scores in a plain Python loop;
+# numpy call overhead dominates for a handful of boxes
+AUTO_SELECT_SCALAR_MAX = 8
+
+# Let start_yolo_preload() warm the model in the background (the API server
+# calls it at startup; set WRESTLEAI_YOLO_PRELOAD=0 to load on first use instead)
+YOLO_PRELOAD = os.environ.get("WRESTLEAI_YOLO_PRELOAD", "1") != "0"
+
+# Serializes the first load between the preload thread and request threads
+_yolo_load_lock = threading.Lock()
+
+
+def _cuda_device_name() -> Optional[str]:
+    """Return the CUDA device name if a GPU is usable, else None."""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return torch.cuda.get_device_name(0)
+    except Exception:
+        pass
+    return None
+
+
+def _engine_path(device_name: str) -> str:
+    """TensorRT engines are GPU- and input-size-specific, so key the file by both."""
+    safe_name = "".join(c if c.isalnum() else "_" for c in device_name).strip("_")
+    return str(_BACKEND_DIR / f"yolov8n_{safe_name}_{YOLO_IMGSZ}.engine")
+
+
+def _export_to(export_path: str, export_format: str, **export_kwargs):
+    """
+    Export the checkpoint in a private temp directory and move the result into place.
+    
+    The API process and every pool worker load the model at the same moment on
+    a cold start. Ultralytics writes exports next to the weights, so exporting
+    in place could let one process load (and keep trusting) another's
+    half-written file; this way export_path only ever appears complete.
+    """
+    YOLO(YOLO_WEIGHTS)  # Downloads the checkpoint if it is missing
+    target_dir = os.path.dirname(os.path.abspath(export_path))
+    with tempfile.TemporaryDirectory(dir=target_dir, prefix=".yolo_export_") as tmp_dir:
+        tmp_weights = os.path.join(tmp_dir, os.path.basename(YOLO_WEIGHTS))
+        shutil.copyfile(YOLO_WEIGHTS, tmp_weights)
+        exported = YOLO(tmp_weights).export(format=export_format, **export_kwargs)
+        try:
+            os.replace(str(exported), export_path)
+        except OSError:
+            # Directory exports (OpenVINO) can't replace one another process finished first
+            if not os.path.exists(export_path):
+                raise
+
+
+def _load_exported_model(export_format: str, export_path: Optional[str] = None, **export_kwargs) -> Optional[YOLO]:
+    """
+    Load an exported YOLO model, exporting it from the .pt checkpoint once if needed.
+    
+    Args:
+        export_format: Ultralytics export format ("onnx", "openvino" or "engine")
+        export_path: Where the exported model is cached (defaults per format)
+        **export_kwargs: Extra arguments forwarded to YOLO.export()
+        
+    Returns:
+        YOLO model backed by the exported runtime, or None if export fails
+    """
+    export_path = export_path or _EXPORT_PATHS.get(export_format)
+    if export_path is None:
+        return None
+    
+    try:
+        if not os.path.exists(export_path):
+            print(f"Exporting {YOLO_WEIGHTS} to {export_format}...")
+            _export_to(export_path, export_format, **export_kwargs)
+        return YOLO(export_path, task="detect")
+    except Exception as e:
+        print(f"Failed to load {export_format} YOLO model: {e}")
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def _load_yolo_model() -> YOLO:
+    """Load the best available YOLO backend and run one warm-up inference."""
+    model = None
+    device_name = _cuda_device_name()
+    if device_name:
+        model = _load_exported_model(
+            "engine",
+            export_path=_engine_path(device_name),
+            half=True,
+            dynamic=True,
+            batch=TRT_MAX_BATCH,
+            imgsz=YOLO_IMGSZ
+        )
+    if model is None and YOLO_EXPORT_FORMAT:
+        model = _load_exported_model(
+            YOLO_EXPORT_FORMAT,
+            dynamic=True,
+            simplify=YOLO_EXPORT_FORMAT == "onnx",
+            imgsz=YOLO_IMGSZ
+        )
+    if model is None:
+        # Use YOLOv8n (nano) model - small, fast, works well on CPU
+        model = YOLO(YOLO_WEIGHTS)
+    
+    # Warm up the runtime session so the first real frame doesn't pay for it
+    model(np.zeros((640, 640, 3), dtype=np.uint8), classes=[0], imgsz=YOLO_IMGSZ, verbose=False)
+    return model
 
 
 def get_yolo_model() -> YOLO:
     """
     Get or create the YOLO model instance.
     Uses YOLOv8n (nano) for speed on CPU.
+    
+    On a CUDA host the model is compiled to an FP16 TensorRT engine. Otherwise
+    it is exported to YOLO_EXPORT_FORMAT so inference runs through
+    ONNX Runtime / OpenVINO instead of eager PyTorch.
     """
-    global _yolo_model
-    if _yolo_model is None:
-        # Use YOLOv8n (nano) model - small, fast, works well on CPU
-        _yolo_model = YOLO("yolov8n.pt")
-    return _yolo_model
+    with _yolo_load_lock:
+        return _load_yolo_model()
+
+
+def _preload_yolo_model():
+    """Background warm-up; errors surface again on the first real call."""
+    try:
+        get_yolo_model()
+    except Exception as e:
+        print(f"YOLO preload failed: {e}")
+
+
+def start_yolo_preload():
+    """
+    Load (and warm) the YOLO model on a background thread if YOLO_PRELOAD is set.
+    
+    Only the API server process opts in; pool workers load the model in their
+    initializer, and scripts importing the package don't download or export anything.
+    """
+    if YOLO_PRELOAD:
+        threading.Thread(target=_preload_yolo_model, daemon=True).start()
+
+
+@dataclass
+class Detections:
+    """
+    Person detections for one frame in struct-of-arrays layout.
+    
+    Keeps boxes and scores as contiguous arrays so selection and IoU matching
+    run as vector math; dicts are only built at the JSON boundary via to_json().
+    """
+    xyxy: np.ndarray  # (N, 4) float64 pixel coords x1, y1, x2, y2
+    score: np.ndarray  # (N,) float64 confidence
+    
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(np.zeros((0, 4), dtype=np.float64), np.zeros(0, dtype=np.float64))
+    
+    @classmethod
+    def from_dicts(cls, boxes: List[Dict]) -> "Detections":
+        """Build from legacy [{"x", "y", "w", "h", "score"}, ...] dicts."""
+        if not boxes:
+            return cls.empty()
+        scores = np.array([b.get("score", 0.0) for b in boxes], dtype=np.float64)
+        return cls(boxes_to_xyxy(boxes), scores)
+    
+    def __len__(self) -> int:
+        return len(self.score)
+    
+    def box(self, idx: int) -> Dict:
+        """Get a single detection as an {id, x, y, w, h, score} dict."""
+        x1, y1, x2, y2 = self.xyxy[idx]
+        return {
+            "id": int(idx),
+            "x": int(x1),
+            "y": int(y1),
+            "w": int(x2 - x1),
+            "h": int(y2 - y1),
+            "score": round(float(self.score[idx]), 3)
+        }
+    
+    def to_json(self) -> List[Dict]:
+        """Convert all detections to JSON-ready dicts."""
+        return [self.box(i) for i in range(len(self))]
+
+
+def _as_detections(detections) -> Detections:
+    """Accept either a Detections container or a legacy list of box dicts."""
+    if isinstance(detections, Detections):
+        return detections
+    return Detections.from_dicts(detections)
+
+
+def _postprocess(result, confidence_threshold: float) -> Detections:
+    """
+    Convert a single YOLO result into person detections.
+    
+    Args:
+        result: One entry of the ultralytics results list
+        confidence_threshold: Minimum confidence for detection
+        
+    Returns:
+        Detections above the confidence threshold
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return Detections.empty()
+    
+    # One device->host copy per result instead of per box
+    xyxy = boxes.xyxy.cpu().numpy().astype(np.float64)
+    confs = boxes.conf.cpu().numpy().astype(np.float64)
+    
+    keep = confs >= confidence_threshold
+    xyxy = xyxy[keep]
+    
+    # Snap to integer pixel boxes (x, y, w, h truncated like the JSON output)
+    x1y1 = np.trunc(xyxy[:, :2])
+    wh = np.trunc(xyxy[:, 2:] - xyxy[:, :2])
+    
+    return Detections(np.hstack([x1y1, x1y1 + wh]), confs[keep])
 
 
 def detect_persons(
     frame: np.ndarray,
     confidence_threshold: float = 0.5
-) -> List[Dict]:
+) -> Detections:
     """
     Detect persons in a single frame using YOLOv8.
     
@@ -38,43 +270,58 @@ def detect_persons(
         confidence_threshold: Minimum confidence for detection
         
     Returns:
-        List of detected person bounding boxes:
+        Detections for the frame; call .to_json() for
         [{"id": 0, "x": int, "y": int, "w": int, "h": int, "score": float}, ...]
     """
     model = get_yolo_model()
     
     # Run inference
     # Class 0 is 'person' in COCO dataset
-    results = model(frame, classes=[0], verbose=False)
-    
-    detections = []
-    for result in results:
-        boxes = result.boxes
-        if boxes is None:
-            continue
-            
-        for i, box in enumerate(boxes):
-            conf = float(box.conf[0])
-            if conf < confidence_threshold:
-                continue
-                
-            # Get bounding box coordinates (x1, y1, x2, y2)
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            
-            detections.append({
-                "id": len(detections),
-                "x": int(x1),
-                "y": int(y1),
-                "w": int(x2 - x1),
-                "h": int(y2 - y1),
-                "score": round(conf, 3)
-            })
-    
-    return detections
+    results = model(frame, classes=[0], imgsz=YOLO_IMGSZ, verbose=False)
+    
+    if not results:
+        return Detections.empty()
+    
+    return _postprocess(results[0], confidence_threshold)
+
+
+def detect_persons_batched(
+    frames: List[np.ndarray],
+    confidence_threshold: float = 0.5,
+    batch_size: int = 16
+) -> List[Detections]:
+    """
+    Detect persons in many frames, running YOLO on chunks of frames at once.
+    
+    Batching lets YOLO amortize letterboxing, normalization and NMS across
+    frames instead of paying the fixed per-call overhead for every frame.
+    
+    Args:
+        frames: List of BGR images as numpy arrays
+        confidence_threshold: Minimum confidence for detection
+        batch_size: Number of frames passed to the model per call
+        
+    Returns:
+        One Detections per input frame, in the same order as `frames`
+    """
+    if not frames:
+        return []
+    
+    model = get_yolo_model()
+    batch_size = max(1, batch_size)
+    
+    all_detections: List[Detections] = []
+    for start in range(0, len(frames), batch_size):
+        chunk = frames[start:start + batch_size]
+        results = model(chunk, classes=[0], imgsz=YOLO_IMGSZ, verbose=False)
+        for result in results:
+            all_detections.append(_postprocess(result, confidence_threshold))
+    
+    return all_detections
 
 
 def auto_select_target(
-    detections: List[Dict],
+    detections,
     frame_width: int,
     frame_height: int
 ) -> Optional[Dict]:
@@ -85,49 +332,54 @@ def auto_select_target(
     Formula: score = area_normalized * 0.6 + center_proximity * 0.4
     
     Args:
-        detections: List of detected bounding boxes
+        detections: Detections (or a list of box dicts)
         frame_width: Width of the frame
         frame_height: Height of the frame
         
     Returns:
         Selected detection dict or None if no detections
     """
-    if not detections:
+    detections = _as_detections(detections)
+    
+    if len(detections) == 0:
         return None
         
     if len(detections) == 1:
-        return detections[0]
+        return detections.box(0)
     
-    frame_center_x = frame_width / 2
-    frame_center_y = frame_height / 2
-    max_area = frame_width * frame_height
-    max_distance = np.sqrt(frame_center_x**2 + frame_center_y**2)
+    frame_center_x = frame_width * 0.5
+    frame_center_y = frame_height * 0.5
     
-    best_detection = None
-    best_score = -1
+    # Fold the 0.6/0.4 weights into the normalizers so scoring has no divisions:
+    # area * 0.6 / max_area + (1 - distance / max_distance) * 0.4
+    #   == area * inv_area + 0.4 - distance * inv_dist
+    inv_area = 0.6 / (frame_width * frame_height)
+    inv_dist = 0.4 / math.hypot(frame_center_x, frame_center_y)
     
-    for det in detections:
-        # Calculate area score (normalized)
-        area = det["w"] * det["h"]
-        area_score = area / max_area
-        
-        # Calculate center proximity score
-        bbox_center_x = det["x"] + det["w"] / 2
-        bbox_center_y = det["y"] + det["h"] / 2
-        distance = np.sqrt(
-            (bbox_center_x - frame_center_x)**2 + 
-            (bbox_center_y - frame_center_y)**2
-        )
-        proximity_score = 1 - (distance / max_distance)
-        
-        # Combined score
-        combined_score = area_score * 0.6 + proximity_score * 0.4
-        
-        if combined_score > best_score:
-            best_score = combined_score
-            best_detection = det
+    if len(detections) <= AUTO_SELECT_SCALAR_MAX:
+        best_idx = 0
+        best_score = -math.inf
+        for i, (x1, y1, x2, y2) in enumerate(detections.xyxy.tolist()):
+            w = x2 - x1
+            h = y2 - y1
+            distance = math.hypot(x1 + w * 0.5 - frame_center_x, y1 + h * 0.5 - frame_center_y)
+            score = w * h * inv_area + 0.4 - distance * inv_dist
+            # Strict comparison keeps the first detection on ties
+            if score > best_score:
+                best_idx, best_score = i, score
+        return detections.box(best_idx)
+    
+    # Score all detections in one vectorized pass over the (N, 4) box array
+    x1, y1, x2, y2 = detections.xyxy.T
+    w = x2 - x1
+    h = y2 - y1
+    
+    distance = np.hypot(x1 + w * 0.5 - frame_center_x, y1 + h * 0.5 - frame_center_y)
     
-    return best_detection
+    # Combined score; argmax keeps the first detection on ties
+    combined_score = w * h * inv_area + 0.4 - distance * inv_dist
+    
+    return detections.box(int(np.argmax(combined_score)))
 
 
 def calculate_iou(box1: Dict, box2: Dict) -> float:
@@ -169,8 +421,40 @@ def calculate_iou(box1: Dict, box2: Dict) -> float:
     return inter_area / union_area
 
 
+def boxes_to_xyxy(boxes: List[Dict]) -> np.ndarray:
+    """
+    Stack x, y, w, h box dicts into an (N, 4) float array of x1, y1, x2, y2.
+    """
+    xywh = np.array([[b["x"], b["y"], b["w"], b["h"]] for b in boxes], dtype=np.float64)
+    xywh = xywh.reshape(-1, 4)
+    xywh[:, 2:] += xywh[:, :2]
+    return xywh
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    Calculate pairwise IoU between two sets of boxes using broadcasting.
+    
+    Args:
+        boxes_a: (N, 4) array of x1, y1, x2, y2
+        boxes_b: (M, 4) array of x1, y1, x2, y2
+        
+    Returns:
+        (N, M) array of IoU values between 0 and 1
+    """
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[:, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[:, 2:])
+    inter_area = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union_area = area_a[:, None] + area_b - inter_area
+    
+    return np.where(union_area > 0, inter_area / np.where(union_area > 0, union_area, 1), 0.0)
+
+
 def find_best_match_by_iou(
-    detections: List[Dict],
+    detections,
     reference_box: Dict,
     min_iou: float = 0.3
 ) -> Optional[Dict]:
@@ -178,23 +462,22 @@ def find_best_match_by_iou(
     Find the detection that best matches a reference box by IoU.
     
     Args:
-        detections: List of detected bounding boxes
+        detections: Detections (or a list of box dicts)
         reference_box: Reference bbox to match against
         min_iou: Minimum IoU threshold for a match
         
     Returns:
-        Best matching detection or None if no good match found
+        Best matching detection dict or None if no good match found
     """
-    if not detections:
+    detections = _as_detections(detections)
+    
+    if len(detections) == 0:
         return None
-        
-    best_match = None
-    best_iou = min_iou
-    
-    for det in detections:
-        iou = calculate_iou(det, reference_box)
-        if iou > best_iou:
-            best_iou = iou
-            best_match = det
-            
-    return best_match
+    
+    ious = iou_matrix(boxes_to_xyxy([reference_box]), detections.xyxy)[0]
+    best_idx = int(np.argmax(ious))
+    
+    if ious[best_idx] > min_iou:
+        return detections.box(best_idx)
+    return None
+
@@ -3,37 +3,74 @@ Model Utilities for Wrestling Coach
 Handles pose landmarker model path resolution and download.
 """
 
+import hashlib
 import os
-from pathlib import Path
-from typing import Optional
+import re
+import urllib.error
 import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, each process downloads to its own file
+    fcntl = None
 
-# Model file info
+# Model file info (lite variant = fastest, equivalent to legacy model_complexity=0)
 POSE_MODEL_FILENAME = "pose_landmarker_lite.task"
 POSE_MODEL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_lite/float16/1/pose_landmarker_lite.task"
 
+# Full variant (legacy model_complexity=1) - slower, better on small subjects
+POSE_MODEL_FULL_FILENAME = "pose_landmarker_full.task"
+POSE_MODEL_FULL_URL = "https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/1/pose_landmarker_full.task"
+
+# Expected SHA-256 of the versioned (float16/1) model files; downloads that don't
+# match are rejected. Set the digests here (or through the environment) - until
+# then only the size announced by the server is checked, and a warning is printed.
+POSE_MODEL_SHA256: Optional[str] = os.environ.get("WRESTLEAI_POSE_MODEL_SHA256") or None
+POSE_MODEL_FULL_SHA256: Optional[str] = os.environ.get("WRESTLEAI_POSE_MODEL_FULL_SHA256") or None
+
+# Model variant -> (filename, URL, expected SHA-256)
+POSE_MODEL_VARIANTS: Dict[str, tuple] = {
+    "lite": (POSE_MODEL_FILENAME, POSE_MODEL_URL, POSE_MODEL_SHA256),
+    "full": (POSE_MODEL_FULL_FILENAME, POSE_MODEL_FULL_URL, POSE_MODEL_FULL_SHA256),
+}
+
+# Download settings
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MB
+DOWNLOAD_TIMEOUT = 60  # seconds
+
 # Get the models directory relative to this file
 _BACKEND_DIR = Path(__file__).resolve().parent.parent
 MODELS_DIR = _BACKEND_DIR / "models"
 
 
-def get_pose_model_path() -> str:
+def get_pose_model_path(variant: str = "lite") -> str:
     """
     Get the path to the pose landmarker model file.
     
+    Args:
+        variant: "lite" (default) or "full"
+    
     Returns:
-        Absolute path to the pose_landmarker_lite.task file
+        Absolute path to the pose_landmarker_<variant>.task file
         
     Raises:
+        ValueError: If the variant is unknown
         RuntimeError: If model file not found and auto-download fails
     """
-    model_path = MODELS_DIR / POSE_MODEL_FILENAME
+    if variant not in POSE_MODEL_VARIANTS:
+        raise ValueError(f"Unknown pose model variant: {variant}")
+    
+    filename, url, sha256 = POSE_MODEL_VARIANTS[variant]
+    model_path = MODELS_DIR / filename
     
     if model_path.exists():
         return str(model_path)
     
     # Try to auto-download
-    if _try_download_model(model_path):
+    if _try_download_model(model_path, url, sha256):
         return str(model_path)
     
     # Download failed, raise helpful error
@@ -41,46 +78,147 @@ def get_pose_model_path() -> str:
         f"Pose landmarker model not found at: {model_path}\n\n"
         f"Please download the model manually:\n"
         f"1. Create directory: {MODELS_DIR}\n"
-        f"2. Download from: {POSE_MODEL_URL}\n"
+        f"2. Download from: {url}\n"
         f"3. Save as: {model_path}\n\n"
-        f"Or run: curl -o {model_path} {POSE_MODEL_URL}"
+        f"Or run: curl -o {model_path} {url}"
     )
 
 
-def _try_download_model(model_path: Path) -> bool:
+@contextmanager
+def _download_lock(model_path: Path):
+    """
+    Hold an exclusive lock on "<model>.lock" for the duration of a download.
+    
+    Analysis workers start together and all ask for the pose model, so only
+    one may write the shared ".part" file; the others block here until it is
+    done. The lock is released by the OS if the holder dies. Without fcntl
+    this is a no-op and _try_download_model uses a per-process ".part" name.
+    """
+    if fcntl is None:
+        yield
+        return
+    
+    with open(model_path.with_name(model_path.name + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _expected_size(response) -> Optional[int]:
+    """Full file size announced by the server (Content-Range total, or Content-Length for a full response)."""
+    if response.status == 206:
+        match = re.search(r"/(\d+)$", response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    length = response.headers.get("Content-Length")
+    return int(length) if length else None
+
+
+def _try_download_model(
+    model_path: Path,
+    url: str = POSE_MODEL_URL,
+    expected_sha256: Optional[str] = POSE_MODEL_SHA256
+) -> bool:
     """
     Attempt to download the pose landmarker model.
     
+    Streams the file in large chunks into a ".part" file, resuming a previous
+    partial download with an HTTP Range request when possible, and verifies
+    the size announced by the server and the SHA-256 digest before atomically
+    moving it into place. A resumed download that fails verification, or a
+    ".part" the server won't resume (HTTP 416), is discarded and fetched again
+    from scratch.
+    
+    Concurrent callers (e.g. worker processes warming up together) are
+    serialized with a lock file; a caller that waited finds the model in
+    place and returns without downloading.
+    
     Args:
         model_path: Target path for the model file
+        url: Model download URL
+        expected_sha256: Expected SHA-256 hex digest, or None to skip the check
         
     Returns:
         True if download succeeded, False otherwise
     """
+    part_name = model_path.name + ".part"
+    if fcntl is None:
+        part_name += f".{os.getpid()}"
+    tmp_path = model_path.with_name(part_name)
+    
     try:
         # Ensure models directory exists
         model_path.parent.mkdir(parents=True, exist_ok=True)
         
-        print(f"Downloading pose landmarker model to {model_path}...")
-        
-        # Download with progress
-        urllib.request.urlretrieve(POSE_MODEL_URL, str(model_path))
+        with _download_lock(model_path):
+            if model_path.exists():
+                return True
+            
+            # Second attempt (if any) always starts from scratch
+            for allow_resume in (True, False):
+                if not allow_resume:
+                    tmp_path.unlink(missing_ok=True)
+                    print("Discarding partial pose model download and starting over")
+                
+                print(f"Downloading pose landmarker model to {model_path}...")
+                
+                digest = hashlib.sha256()
+                resume_from = tmp_path.stat().st_size if tmp_path.exists() else 0
+                
+                request = urllib.request.Request(url)
+                if resume_from:
+                    request.add_header("Range", f"bytes={resume_from}-")
+                
+                try:
+                    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                        resumed = resume_from > 0 and response.status == 206
+                        if resumed:
+                            # Server honoured the range - hash what we already have, then append
+                            with open(tmp_path, "rb") as f:
+                                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+                                    digest.update(chunk)
+                        expected_size = _expected_size(response)
+                        
+                        with open(tmp_path, "ab" if resumed else "wb") as f:
+                            for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                                digest.update(chunk)
+                                f.write(chunk)
+                except urllib.error.HTTPError as e:
+                    if e.code == 416 and resume_from:
+                        # Range not satisfiable: the .part is complete or stale
+                        continue
+                    raise
+                
+                size = tmp_path.stat().st_size if tmp_path.exists() else 0
+                sha256 = digest.hexdigest()
+                
+                problem = None
+                if size == 0:
+                    problem = "empty download"
+                elif expected_size is not None and size != expected_size:
+                    problem = f"size mismatch: expected {expected_size} bytes, got {size}"
+                elif expected_sha256 and sha256 != expected_sha256:
+                    problem = f"checksum mismatch: expected {expected_sha256}, got {sha256}"
+                
+                if problem is None:
+                    os.replace(tmp_path, model_path)
+                    print(f"Successfully downloaded pose model ({size / 1024 / 1024:.1f} MB, sha256 {sha256})")
+                    if not expected_sha256:
+                        print(f"Warning: no SHA-256 pinned for {model_path.name}; its integrity was not verified")
+                    return True
+                
+                print(f"Pose model download failed verification ({problem})")
+                if not resumed:
+                    tmp_path.unlink(missing_ok=True)
+                    return False
         
-        # Verify file was downloaded
-        if model_path.exists() and model_path.stat().st_size > 0:
-            print(f"Successfully downloaded pose model ({model_path.stat().st_size / 1024 / 1024:.1f} MB)")
-            return True
-        else:
-            return False
+        tmp_path.unlink(missing_ok=True)
+        return False
             
     except Exception as e:
+        # Keep the .part file so the next attempt can resume
         print(f"Failed to auto-download model: {e}")
-        # Clean up partial download
-        if model_path.exists():
-            try:
-                model_path.unlink()
-            except:
-                pass
         return False
 
 
@@ -5,21 +5,37 @@ Now with target tracking, cropped pose analysis, and wrestling event detection.
 """
 
 import math
+import os
+import sys
+import threading
+import time
 from typing import Optional, Dict, List, Tuple, Set
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 import cv2
 import mediapipe as mp
 from mediapipe.tasks import python as mp_tasks
 from mediapipe.tasks.python import vision as mp_vision
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; kernels run as plain Python without it
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 from .tracking import TargetTracker, expand_box
 from .detection import detect_persons, auto_select_target
 from .model_utils import get_pose_model_path
+from .video_io import NullVideoWriter, open_video, open_video_writer, prefetch_frames, release_all, seek_frame
 
 # Get pose landmark connections from Tasks API
 POSE_CONNECTIONS = mp_vision.PoseLandmarksConnections.POSE_LANDMARKS
 
+# The same connections as an (N, 2) index array, built once for drawing
+_POSE_CONNECTION_PAIRS = np.array([(c.start, c.end) for c in POSE_CONNECTIONS], dtype=np.intp)
+
 # Pose landmark indices (from MediaPipe)
 NOSE = 0
 LEFT_EAR = 7
@@ -69,40 +85,337 @@ STANCE_WOBBLE_THRESHOLD = 0.003  # High variance in stance width
 # Backend setting: max seconds to analyze
 MAX_SECONDS = 20
 
+# Pose input size: ROIs with a short side above this are downscaled before inference.
+# Landmarks are normalized to the ROI, so they map back to full resolution unchanged.
+# Matches the landmark model's 256x256 input; aspect ratio is kept so the
+# detector's letterboxing sees an undistorted person.
+POSE_INPUT_SHORT_SIDE = 256
+
+# Target rate for pose inference. Stance/angle metrics change over ~100 ms, so
+# neighbouring frames are near-duplicates; the frame stride is derived from the
+# clip fps (30 fps -> every 2nd frame, 60 fps -> every 4th). Skipped frames
+# are drawn with the last overlay, or one interpolated between the
+# surrounding samples where the next sample is already known.
+POSE_SAMPLE_HZ = 15.0
+
+# ROIs per inference call for pose backends that support batching (TensorRT, ONNX Runtime)
+POSE_BATCH_SIZE = 16
+
+# Memory cap for full-resolution frames held until their batch's poses are drawn
+# (~21 frames at 1080p); a batch is flushed early when it would exceed this
+POSE_PENDING_MAX_BYTES = 128 * 1024 * 1024
+
+# Reuse the previous pose result when the ROI's 16x16 thumbnail differs from the
+# last inferred one by less than this mean absolute intensity (0-255 scale)
+POSE_REUSE_MAX_DIFF = 2.0
+POSE_REUSE_THUMB_SIZE = 16
+
+# Pose inference backend: "mediapipe" (default), "trt" (TensorRT landmark
+# engine, see pose_trt.py) or "onnx" (batched ONNX Runtime, see pose_onnx.py).
+# Falls back to MediaPipe if the selected backend can't be loaded.
+POSE_BACKEND = os.environ.get("WRESTLEAI_POSE_BACKEND", "mediapipe").lower()
+
+# Pose landmarker model: "lite", "full", or "auto" (lite unless the target is small)
+POSE_MODEL_VARIANT = "auto"
+
+# In "auto" mode, targets smaller than this (pixels, either side) use the full model
+SMALL_TARGET_SIDE = 160
+
+# Full-model inferences timed before "auto" decides whether to fall back to lite
+POSE_PROBE_CALLS = 30
+
+# Frames sampled across a clip by the up-front "is there a pose at all" check
+POSE_PRECHECK_SAMPLES = 10
+
 
 def create_pose_landmarker(
     running_mode: mp_vision.RunningMode = mp_vision.RunningMode.VIDEO,
     num_poses: int = 1,
     min_detection_confidence: float = 0.5,
-    min_tracking_confidence: float = 0.5
+    min_tracking_confidence: float = 0.5,
+    use_gpu: bool = True,
+    model_variant: str = "lite"
 ) -> mp_vision.PoseLandmarker:
     """
     Create a PoseLandmarker instance using the MediaPipe Tasks API.
     
+    Uses the "lite" landmarker model (the Tasks equivalent of legacy
+    model_complexity=0) with segmentation masks disabled. It is roughly 2x
+    faster than the full model, and its landmark precision is sufficient for
+    the joint angles, stance width and hand height metrics computed here.
+    
     Args:
         running_mode: VIDEO for frame-by-frame processing, IMAGE for single images
         num_poses: Maximum number of poses to detect (1 since we track a single wrestler)
         min_detection_confidence: Minimum confidence for pose detection
         min_tracking_confidence: Minimum confidence for pose tracking
-        
+        use_gpu: Try the GPU delegate first, falling back to CPU (XNNPACK) if unavailable
+        model_variant: "lite" (default) or "full" landmarker model
+    
     Returns:
         Configured PoseLandmarker instance
     """
-    model_path = get_pose_model_path()
+    model_path = get_pose_model_path(model_variant)
     
-    base_options = mp_tasks.BaseOptions(model_asset_path=model_path)
+    delegates = [mp_tasks.BaseOptions.Delegate.CPU]
+    if use_gpu:
+        delegates.insert(0, mp_tasks.BaseOptions.Delegate.GPU)
     
-    options = mp_vision.PoseLandmarkerOptions(
-        base_options=base_options,
-        running_mode=running_mode,
-        num_poses=num_poses,
-        min_pose_detection_confidence=min_detection_confidence,
-        min_pose_presence_confidence=min_detection_confidence,
-        min_tracking_confidence=min_tracking_confidence,
-        output_segmentation_masks=False
+    landmarker, _ = _create_with_first_delegate(
+        {"model_asset_path": model_path}, delegates, running_mode,
+        num_poses, min_detection_confidence, min_tracking_confidence
     )
+    return landmarker
+
+
+def _create_with_first_delegate(
+    model_asset: Dict,
+    delegates: List,
+    running_mode: mp_vision.RunningMode,
+    num_poses: int = 1,
+    min_detection_confidence: float = 0.5,
+    min_tracking_confidence: float = 0.5
+):
+    """
+    Create a PoseLandmarker with the first delegate in `delegates` that works.
+    
+    Args:
+        model_asset: BaseOptions model source, {"model_asset_path": ...} or
+            {"model_asset_buffer": ...}
+    
+    Returns:
+        (landmarker, delegate it was created with)
+    """
+    last_error = None
+    for delegate in delegates:
+        base_options = mp_tasks.BaseOptions(delegate=delegate, **model_asset)
+        
+        options = mp_vision.PoseLandmarkerOptions(
+            base_options=base_options,
+            running_mode=running_mode,
+            num_poses=num_poses,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_pose_presence_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            output_segmentation_masks=False
+        )
+        
+        try:
+            return mp_vision.PoseLandmarker.create_from_options(options), delegate
+        except Exception as e:
+            # GPU delegate is not available on every platform/build
+            last_error = e
+    
+    raise RuntimeError(f"Could not create pose landmarker: {last_error}")
+
+
+def pose_stride_for_fps(fps: float, sample_hz: float = POSE_SAMPLE_HZ) -> int:
+    """Frame stride that samples pose at roughly sample_hz (at least every frame)."""
+    if fps <= 0 or sample_hz <= 0:
+        return 1
+    return max(1, int(round(fps / sample_hz)))
+
+
+class ReusablePoseLandmarker:
+    """
+    VIDEO-mode PoseLandmarker whose setup is reused across clips.
+    
+    A VIDEO-mode landmarker tracks the pose from frame to frame, so it can't
+    carry over between clips without the previous clip's pose leaking into the
+    next one's first frames. finish_clip() therefore closes the graph and
+    starts building its replacement on a background thread, from the model
+    bytes read once here and the delegate that worked the first time, so the
+    next clip starts on a ready graph without a model lookup, file read or
+    failed GPU attempt.
+    """
+    
+    def __init__(self, model_variant: str = "lite"):
+        with open(get_pose_model_path(model_variant), "rb") as f:
+            self._model_asset = {"model_asset_buffer": f.read()}
+        self._delegates = [mp_tasks.BaseOptions.Delegate.GPU, mp_tasks.BaseOptions.Delegate.CPU]
+        self._landmarker = None
+        self._next_landmarker = None
+        self._next_thread: Optional[threading.Thread] = None
+        self._build()
+    
+    def _create(self):
+        landmarker, delegate = _create_with_first_delegate(
+            self._model_asset, self._delegates, mp_vision.RunningMode.VIDEO
+        )
+        self._delegates = [delegate]
+        return landmarker
+    
+    def _create_next(self):
+        try:
+            self._next_landmarker = self._create()
+        except Exception as e:
+            # The next clip builds its graph itself and surfaces the error
+            print(f"Background pose landmarker build failed: {e}")
+    
+    def _take_next(self):
+        """The graph built by finish_clip(), once it is ready (None if that build failed)."""
+        if self._next_thread is not None:
+            self._next_thread.join()
+            self._next_thread = None
+        landmarker, self._next_landmarker = self._next_landmarker, None
+        return landmarker
+    
+    def _build(self):
+        self._landmarker = self._take_next() or self._create()
+        self._last_ms = -1
+    
+    def detect_for_video(self, image: mp.Image, timestamp_ms: int):
+        if self._landmarker is None:
+            self._build()
+        # MediaPipe requires strictly increasing timestamps
+        timestamp_ms = max(timestamp_ms, self._last_ms + 1)
+        self._last_ms = timestamp_ms
+        return self._landmarker.detect_for_video(image, timestamp_ms)
+    
+    def finish_clip(self):
+        """Mark the end of a clip; the next clip starts with fresh tracking state."""
+        if self._landmarker is None:
+            return  # Nothing ran since the last reset
+        self._landmarker.close()
+        self._landmarker = None
+        self._next_thread = threading.Thread(target=self._create_next, name="pose-landmarker-build", daemon=True)
+        self._next_thread.start()
+    
+    def close(self):
+        if self._landmarker is not None:
+            self._landmarker.close()
+            self._landmarker = None
+        next_landmarker = self._take_next()
+        if next_landmarker is not None:
+            next_landmarker.close()
+
+
+# Per-thread landmarkers (MediaPipe graphs are not thread-safe), keyed by model variant
+_pose_landmarkers = threading.local()
+
+
+def get_pose_landmarker(model_variant: str = "lite"):
+    """
+    Get this thread's reusable VIDEO-mode landmarker for a model variant.
     
-    return mp_vision.PoseLandmarker.create_from_options(options)
+    Returns a TRTPoseLandmarker or ONNXPoseLandmarker when POSE_BACKEND
+    selects one and it loads, otherwise a ReusablePoseLandmarker (MediaPipe).
+    Call finish_clip() on it when a clip is done instead of close().
+    """
+    cache = getattr(_pose_landmarkers, "cache", None)
+    if cache is None:
+        cache = _pose_landmarkers.cache = {}
+    if model_variant not in cache:
+        landmarker = None
+        if POSE_BACKEND == "trt":
+            try:
+                from .pose_trt import TRTPoseLandmarker
+                landmarker = TRTPoseLandmarker(model_variant)
+            except Exception as e:
+                print(f"TensorRT pose backend unavailable, using MediaPipe: {e}")
+        elif POSE_BACKEND == "onnx":
+            try:
+                from .pose_onnx import ONNXPoseLandmarker
+                landmarker = ONNXPoseLandmarker(model_variant)
+            except Exception as e:
+                print(f"ONNX Runtime pose backend unavailable, using MediaPipe: {e}")
+        cache[model_variant] = landmarker or ReusablePoseLandmarker(model_variant)
+    return cache[model_variant]
+
+
+# Per-thread IMAGE-mode landmarkers for single-frame checks, keyed by model variant
+_image_pose_landmarkers = threading.local()
+
+
+def get_image_pose_landmarker(model_variant: str = "lite"):
+    """
+    Get this thread's landmarker for one-off detect() calls on single frames.
+    
+    MediaPipe runs it in IMAGE mode, which keeps no tracking state, so it is
+    never reset or closed and doesn't disturb the VIDEO-mode landmarker the
+    analysis uses. The TensorRT and ONNX Runtime backends are stateless, so
+    their get_pose_landmarker() instance is shared.
+    """
+    if POSE_BACKEND in ("trt", "onnx"):
+        landmarker = get_pose_landmarker(model_variant)
+        if not isinstance(landmarker, ReusablePoseLandmarker):
+            return landmarker
+    
+    cache = getattr(_image_pose_landmarkers, "cache", None)
+    if cache is None:
+        cache = _image_pose_landmarkers.cache = {}
+    if model_variant not in cache:
+        cache[model_variant] = create_pose_landmarker(
+            running_mode=mp_vision.RunningMode.IMAGE, model_variant=model_variant
+        )
+    return cache[model_variant]
+
+
+def select_pose_model_variant(target_box: Optional[Dict], variant: str = POSE_MODEL_VARIANT) -> str:
+    """
+    Resolve the pose model variant for a target.
+    
+    "auto" picks the lite model unless the target box is smaller than
+    SMALL_TARGET_SIDE on either side, where the full model holds landmarks better.
+    """
+    if variant != "auto":
+        return variant
+    if target_box and min(target_box["w"], target_box["h"]) < SMALL_TARGET_SIDE:
+        return "full"
+    return "lite"
+
+
+class AdaptivePoseLandmarker:
+    """
+    Full-model landmarker that drops to the lite model when it can't keep up.
+    
+    Times the first `probe_calls` inferences of a clip (after a warm-up call);
+    if they average more than `budget_s` - the time between pose samples at
+    POSE_SAMPLE_HZ - the rest of the clip runs on the lite model.
+    """
+    
+    def __init__(self, full_landmarker, budget_s: float = 1.0 / POSE_SAMPLE_HZ,
+                 probe_calls: int = POSE_PROBE_CALLS):
+        self._full = full_landmarker
+        self._active = full_landmarker
+        self._budget_s = budget_s
+        self._probe_calls = probe_calls
+        self._calls = 0
+        self._elapsed = 0.0
+    
+    def detect_for_video(self, image: mp.Image, timestamp_ms: int):
+        if self._calls > self._probe_calls:
+            return self._active.detect_for_video(image, timestamp_ms)
+        
+        start = time.perf_counter()
+        result = self._active.detect_for_video(image, timestamp_ms)
+        if self._calls > 0:  # First call includes delegate warm-up
+            self._elapsed += time.perf_counter() - start
+        self._calls += 1
+        
+        if self._calls > self._probe_calls and self._elapsed / self._probe_calls > self._budget_s:
+            print(f"Full pose model averaged {self._elapsed / self._probe_calls * 1000:.0f} ms, switching to lite")
+            self._active = get_pose_landmarker("lite")
+        return result
+    
+    def finish_clip(self):
+        self._full.finish_clip()
+        if self._active is not self._full:
+            self._active.finish_clip()
+
+
+def pose_landmarker_for_target(target_box: Optional[Dict], variant: str = POSE_MODEL_VARIANT):
+    """
+    Get this thread's landmarker for a target (see select_pose_model_variant).
+    
+    When "auto" picks the full MediaPipe model, it is wrapped in an
+    AdaptivePoseLandmarker so a slow host falls back to lite mid-clip.
+    """
+    resolved = select_pose_model_variant(target_box, variant)
+    landmarker = get_pose_landmarker(resolved)
+    if variant == "auto" and resolved == "full" and isinstance(landmarker, ReusablePoseLandmarker):
+        return AdaptivePoseLandmarker(landmarker)
+    return landmarker
 
 
 def draw_pose_landmarks(
@@ -123,7 +436,8 @@ def draw_pose_landmarks(
     
     Args:
         frame: BGR image as numpy array
-        pose_landmarks: List of NormalizedLandmark from PoseLandmarker
+        pose_landmarks: List of NormalizedLandmark from PoseLandmarker, or an
+            (N, 4) landmark array from landmarks_to_array
         connections: Optional set of (start, end) tuples for connections
         landmark_color: BGR color for landmarks
         connection_color: BGR color for connections
@@ -136,54 +450,197 @@ def draw_pose_landmarks(
     
     height, width = frame.shape[:2]
     
+    # Work on one (N, 4) array: pixel coords and visibility for all landmarks at once
+    if not isinstance(pose_landmarks, np.ndarray):
+        pose_landmarks = landmarks_to_array(pose_landmarks)
+    points = (pose_landmarks[:, :2] * (width, height)).astype(np.int32)
+    visible = pose_landmarks[:, 3] >= min_visibility
+    num_landmarks = len(points)
+    
     # Use default connections if not provided
     if connections is None:
-        connections = POSE_CONNECTIONS
+        pairs = _POSE_CONNECTION_PAIRS
+    else:
+        pairs = np.array([(c.start, c.end) for c in connections], dtype=np.intp).reshape(-1, 2)
     
-    # Draw connections first (so landmarks are on top)
-    for connection in connections:
-        start_idx = connection.start
-        end_idx = connection.end
-        
-        if start_idx >= len(pose_landmarks) or end_idx >= len(pose_landmarks):
-            continue
-        
-        start_lm = pose_landmarks[start_idx]
-        end_lm = pose_landmarks[end_idx]
-        
-        # Check visibility
-        start_vis = getattr(start_lm, 'visibility', 1.0)
-        end_vis = getattr(end_lm, 'visibility', 1.0)
-        
-        if start_vis < min_visibility or end_vis < min_visibility:
-            continue
-        
-        # Convert normalized coords to pixel coords
-        start_x = int(start_lm.x * width)
-        start_y = int(start_lm.y * height)
-        end_x = int(end_lm.x * width)
-        end_y = int(end_lm.y * height)
-        
-        # Draw connection line
-        cv2.line(frame, (start_x, start_y), (end_x, end_y), 
-                connection_color, connection_thickness)
+    # Draw connections first (so landmarks are on top), skipping missing or
+    # invisible endpoints; all segments go to one polylines call
+    pairs = pairs[(pairs < num_landmarks).all(axis=1)]
+    pairs = pairs[visible[pairs[:, 0]] & visible[pairs[:, 1]]]
+    if len(pairs):
+        cv2.polylines(frame, points[pairs], False, connection_color, connection_thickness)
+    
+    points = points.tolist()
+    visible = visible.tolist()
     
     # Draw landmarks
-    for lm in pose_landmarks:
-        visibility = getattr(lm, 'visibility', 1.0)
-        if visibility < min_visibility:
+    for (x, y), is_visible in zip(points, visible):
+        if not is_visible:
             continue
         
-        x = int(lm.x * width)
-        y = int(lm.y * height)
-        
         # Draw filled circle for landmark
         cv2.circle(frame, (x, y), landmark_radius, landmark_color, -1)
         # Draw outline for better visibility
         cv2.circle(frame, (x, y), landmark_radius, (0, 0, 0), 1)
 
 
-@dataclass
+def pose_input_size(width: int, height: int, short_side: int = POSE_INPUT_SHORT_SIDE) -> Tuple[int, int]:
+    """(width, height) after capping the short side at `short_side` pixels."""
+    current_short = min(height, width)
+    if current_short <= short_side:
+        return width, height
+    
+    scale = short_side / current_short
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def downscale_for_pose(image: np.ndarray, short_side: int = POSE_INPUT_SHORT_SIDE) -> np.ndarray:
+    """
+    Downscale an image so its short side is at most `short_side` pixels.
+    
+    Pose inference cost scales with pixel count while MediaPipe resizes to a
+    ~256px input internally anyway, so large ROIs are shrunk up front.
+    Returns the input unchanged if it is already small enough.
+    """
+    h, w = image.shape[:2]
+    new_size = pose_input_size(w, h, short_side)
+    if new_size == (w, h):
+        return image
+    return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+
+
+class RGBFrameBuffer:
+    """
+    Reusable backing store for BGR->RGB conversion of variable-size ROIs.
+    
+    The tracked ROI changes size every frame, so flat buffers sized for the
+    full frame are kept and reshaped into contiguous views per ROI. This
+    avoids allocating a new RGB image (and a resized copy) for every frame
+    sent to MediaPipe.
+    """
+    
+    def __init__(self, width: int, height: int):
+        self._buffer = np.empty(width * height * 3, dtype=np.uint8)
+        self._scaled = np.empty(0, dtype=np.uint8)
+    
+    @staticmethod
+    def _view(buffer: np.ndarray, h: int, w: int) -> Tuple[np.ndarray, np.ndarray]:
+        size = h * w * 3
+        if size > buffer.size:
+            buffer = np.empty(size, dtype=np.uint8)
+        return buffer, buffer[:size].reshape(h, w, 3)
+    
+    def convert(self, bgr: np.ndarray) -> np.ndarray:
+        """Convert a BGR image to RGB in the shared buffer and return the view."""
+        h, w = bgr.shape[:2]
+        self._buffer, rgb = self._view(self._buffer, h, w)
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+    
+    def convert_for_pose(self, roi: np.ndarray, short_side: int = POSE_INPUT_SHORT_SIDE) -> np.ndarray:
+        """
+        Downscale a BGR ROI for pose inference (see downscale_for_pose) and
+        convert it to RGB, resizing into a second reused buffer.
+        """
+        h, w = roi.shape[:2]
+        new_w, new_h = pose_input_size(w, h, short_side)
+        if (new_w, new_h) == (w, h):
+            return self.convert(roi)
+        
+        self._scaled, scaled = self._view(self._scaled, new_h, new_w)
+        cv2.resize(roi, (new_w, new_h), dst=scaled, interpolation=cv2.INTER_AREA)
+        return self.convert(scaled)
+
+
+class PoseResultCache:
+    """
+    Skips pose inference on near-duplicate ROIs.
+    
+    A tiny thumbnail of each ROI is compared with the one from the last frame
+    that actually ran inference; when the target is static (warm-up, stoppages)
+    the previous result is returned instead. Results hold ROI-normalized
+    landmarks, so they are re-mapped with the current ROI as usual.
+    """
+    
+    def __init__(self, max_diff: float = POSE_REUSE_MAX_DIFF, thumb_size: int = POSE_REUSE_THUMB_SIZE):
+        self._max_diff = max_diff
+        self._thumb_size = (thumb_size, thumb_size)
+        self._thumb = None
+        self._pending_thumb = None
+        self._results = None
+    
+    def lookup(self, roi: np.ndarray):
+        """Return the cached result if `roi` matches the last inferred ROI, else None."""
+        thumb = cv2.resize(roi, self._thumb_size, interpolation=cv2.INTER_AREA).astype(np.int16)
+        if self._results is not None and float(np.mean(np.abs(thumb - self._thumb))) < self._max_diff:
+            return self._results
+        self._pending_thumb = thumb
+        return None
+    
+    def store(self, results):
+        """Remember the result of inference on the ROI passed to the last missed lookup()."""
+        self._thumb = self._pending_thumb
+        self._results = results
+
+
+class ROIPoseRunner:
+    """
+    Pose inference on the tracked target's ROI, returned in full-frame coordinates.
+    
+    Holds what the analysis loops share around a landmarker: the reused RGB
+    conversion buffer, the near-duplicate ROI cache, and the mapping of
+    ROI-normalized results back to frame landmark arrays.
+    """
+    
+    def __init__(self, pose_landmarker, width: int, height: int):
+        self.landmarker = pose_landmarker
+        self.width = width
+        self.height = height
+        self.rgb_buffer = RGBFrameBuffer(width, height)
+        self.cache = PoseResultCache()
+        # Backends with detect_batch (TensorRT, ONNX Runtime) take several ROIs per
+        # call; MediaPipe's VIDEO mode is strictly frame-by-frame
+        self.batch_size = POSE_BATCH_SIZE if hasattr(pose_landmarker, "detect_batch") else 1
+    
+    def _frame_landmarks(self, results, roi_box: Tuple[int, int, int, int]) -> Optional[np.ndarray]:
+        # Tasks API returns a list of poses; use the first
+        if not results.pose_landmarks:
+            return None
+        roi_x, roi_y, roi_w, roi_h = roi_box
+        return landmarks_to_frame_array(results.pose_landmarks[0], roi_x, roi_y, roi_w, roi_h, self.width, self.height)
+    
+    def detect(self, frame: np.ndarray, roi_box: Tuple[int, int, int, int], timestamp_ms: int) -> Optional[np.ndarray]:
+        """Frame landmark array for the pose in `roi_box` of `frame`, or None if no pose was found."""
+        roi_x, roi_y, roi_w, roi_h = roi_box
+        roi = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+        
+        # Reuse the last result if the ROI barely changed
+        results = self.cache.lookup(roi)
+        if results is None:
+            # Convert ROI to RGB for MediaPipe Tasks API (reusing one buffer)
+            roi_rgb = self.rgb_buffer.convert_for_pose(roi)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_rgb)
+            results = self.landmarker.detect_for_video(mp_image, timestamp_ms)
+            self.cache.store(results)
+        return self._frame_landmarks(results, roi_box)
+    
+    def batch_input(self, frame: np.ndarray, roi_box: Tuple[int, int, int, int]) -> np.ndarray:
+        """RGB pose input for a ROI, copied out of the shared buffer so it can wait for detect_batch()."""
+        roi_x, roi_y, roi_w, roi_h = roi_box
+        return self.rgb_buffer.convert_for_pose(frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]).copy()
+    
+    def detect_batch(self, roi_rgbs: List[np.ndarray], roi_boxes: List[Tuple[int, int, int, int]]) -> List[Optional[np.ndarray]]:
+        """Frame landmark arrays (or None) for several batch_input() ROIs in one inference call."""
+        results = self.landmarker.detect_batch(roi_rgbs)
+        return [self._frame_landmarks(r, roi_box) for r, roi_box in zip(results, roi_boxes)]
+
+
+# Per-frame records are created by the hundred per clip; slots drop the
+# per-instance __dict__ (dataclass slots need Python 3.10+)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class FrameMetrics:
     """Metrics computed for a single frame."""
     knee_angle_left: Optional[float] = None
@@ -213,9 +670,12 @@ class FrameMetrics:
     # Trail leg metrics (for shot analysis)
     rear_knee_angle: Optional[float] = None  # Angle of the rear/trail leg during shot
     lead_knee_angle: Optional[float] = None  # Angle of the lead leg during shot
+    
+    # Raw kernel output in FRAME_METRIC_FIELDS order (NaN = missing), kept for columnar aggregation
+    values: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 
-@dataclass 
+@dataclass(**_DATACLASS_SLOTS)
 class TimelineEvent:
     """A timestamped event when a metric exceeded threshold."""
     timestamp: float
@@ -225,20 +685,28 @@ class TimelineEvent:
     message: str
 
 
+_RAD2DEG = 180.0 / math.pi
+
+
 def calculate_angle(a: tuple, b: tuple, c: tuple) -> float:
     """
     Calculate angle at point b given three points (a, b, c).
     Returns angle in degrees as native Python float.
+    
+    Uses plain float math - for 2-D points NumPy's array allocation and
+    dispatch cost far more than the handful of multiplies involved.
     """
-    ba = np.array([a[0] - b[0], a[1] - b[1]])
-    bc = np.array([c[0] - b[0], c[1] - b[1]])
+    bax, bay = a[0] - b[0], a[1] - b[1]
+    bcx, bcy = c[0] - b[0], c[1] - b[1]
     
-    cosine = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc) + 1e-6)
-    cosine = np.clip(cosine, -1.0, 1.0)
-    angle = np.degrees(np.arccos(cosine))
+    norm = math.sqrt((bax * bax + bay * bay) * (bcx * bcx + bcy * bcy)) + 1e-6
+    cosine = (bax * bcx + bay * bcy) / norm
+    if cosine > 1.0:
+        cosine = 1.0
+    elif cosine < -1.0:
+        cosine = -1.0
     
-    # Convert numpy float to native Python float
-    return float(angle)
+    return math.acos(cosine) * _RAD2DEG
 
 
 def get_landmark_coords(landmarks, idx: int, min_visibility: float = 0.5) -> Optional[tuple]:
@@ -264,133 +732,309 @@ def get_landmark_coords(landmarks, idx: int, min_visibility: float = 0.5) -> Opt
     return (lm.x, lm.y)
 
 
-def analyze_frame_landmarks(landmarks, timestamp: float = 0.0) -> FrameMetrics:
+# FrameMetrics fields produced by the per-frame kernel, in output-array order
+FRAME_METRIC_FIELDS = (
+    "knee_angle_left", "knee_angle_right", "knee_angle_avg", "stance_width",
+    "hands_drop", "back_lean_angle", "hip_height_ratio", "elbow_flare_left",
+    "elbow_flare_right", "elbow_flare_avg", "head_position", "hip_y_norm",
+    "torso_angle", "head_y_relative", "wrist_forward_dist", "ankle_x_left",
+    "ankle_x_right", "ankle_center_x", "shoulder_center_y", "hip_center_y",
+    "rear_knee_angle", "lead_knee_angle",
+)
+(
+    _KNEE_L, _KNEE_R, _KNEE_AVG, _STANCE, _HANDS_DROP, _BACK_LEAN, _HIP_RATIO,
+    _FLARE_L, _FLARE_R, _FLARE_AVG, _HEAD_POS, _HIP_Y_NORM, _TORSO, _HEAD_Y_REL,
+    _WRIST_FWD, _ANKLE_X_L, _ANKLE_X_R, _ANKLE_CX, _SHOULDER_CY, _HIP_CY,
+    _REAR_KNEE, _LEAD_KNEE,
+) = range(len(FRAME_METRIC_FIELDS))
+_NUM_FRAME_METRICS = len(FRAME_METRIC_FIELDS)
+FRAME_METRIC_INDEX = {name: i for i, name in enumerate(FRAME_METRIC_FIELDS)}
+
+# FrameMetrics declares the kernel fields in FRAME_METRIC_FIELDS order with
+# timestamp in between, so it can be built positionally (no kwargs dict)
+_TIMESTAMP_ARG = [f.name for f in fields(FrameMetrics)].index("timestamp")
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
     """
-    Analyze a single frame's pose landmarks.
-    Returns comprehensive metrics including event detection data.
+    Copy pose landmarks into a (num_landmarks, 4) float64 array of x, y, z, visibility.
+    
+    Works with both:
+    - Legacy protobuf format (NormalizedLandmarkList with .landmark attribute)
+    - Tasks API format (list of NormalizedLandmark objects)
+    
+    The values are streamed straight into the array with np.fromiter, so no
+    intermediate tuples or lists are built.
     """
-    metrics = FrameMetrics(timestamp=timestamp)
-    
-    # Get all relevant landmarks
-    nose = get_landmark_coords(landmarks, NOSE)
-    left_ear = get_landmark_coords(landmarks, LEFT_EAR)
-    right_ear = get_landmark_coords(landmarks, RIGHT_EAR)
-    left_shoulder = get_landmark_coords(landmarks, LEFT_SHOULDER)
-    right_shoulder = get_landmark_coords(landmarks, RIGHT_SHOULDER)
-    left_elbow = get_landmark_coords(landmarks, LEFT_ELBOW)
-    right_elbow = get_landmark_coords(landmarks, RIGHT_ELBOW)
-    left_wrist = get_landmark_coords(landmarks, LEFT_WRIST)
-    right_wrist = get_landmark_coords(landmarks, RIGHT_WRIST)
-    left_hip = get_landmark_coords(landmarks, LEFT_HIP)
-    right_hip = get_landmark_coords(landmarks, RIGHT_HIP)
-    left_knee = get_landmark_coords(landmarks, LEFT_KNEE)
-    right_knee = get_landmark_coords(landmarks, RIGHT_KNEE)
-    left_ankle = get_landmark_coords(landmarks, LEFT_ANKLE)
-    right_ankle = get_landmark_coords(landmarks, RIGHT_ANKLE)
+    if isinstance(landmarks, np.ndarray):
+        # Already an (N, 4) array (e.g. from the TensorRT backend)
+        return landmarks.astype(np.float64, copy=True)
     
-    # 1. Knee angles (individual and average)
-    if left_hip and left_knee and left_ankle:
-        metrics.knee_angle_left = calculate_angle(left_hip, left_knee, left_ankle)
-    if right_hip and right_knee and right_ankle:
-        metrics.knee_angle_right = calculate_angle(right_hip, right_knee, right_ankle)
+    landmark_list = landmarks.landmark if hasattr(landmarks, 'landmark') else landmarks
+    return np.fromiter(
+        _iter_landmark_values(landmark_list),
+        dtype=np.float64,
+        count=len(landmark_list) * 4
+    ).reshape(-1, 4)
+
+
+def _iter_landmark_values(landmark_list):
+    for lm in landmark_list:
+        visibility = getattr(lm, 'visibility', 1.0)
+        yield lm.x
+        yield lm.y
+        yield getattr(lm, 'z', 0.0) or 0.0
+        yield 1.0 if visibility is None else visibility
+
+
+# LLVM fast-math flags for the metric kernels. "nnan"/"ninf" are left out on
+# purpose: missing metrics are NaN and the kernel checks for them.
+_KERNEL_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+# The kernels only touch their array arguments, so they release the GIL: analyses
+# run from threads (rather than the worker pool) compute metrics concurrently.
+
+
+@njit(cache=True, nogil=True, fastmath=_KERNEL_FASTMATH)
+def _angle_xy(ax, ay, bx, by, cx, cy):
+    """Angle at b in degrees - same math as calculate_angle."""
+    bax = ax - bx
+    bay = ay - by
+    bcx = cx - bx
+    bcy = cy - by
+    norm = math.sqrt((bax * bax + bay * bay) * (bcx * bcx + bcy * bcy)) + 1e-6
+    cosine = (bax * bcx + bay * bcy) / norm
+    cosine = max(-1.0, min(1.0, cosine))
+    return math.degrees(math.acos(cosine))
+
+
+@njit(cache=True, nogil=True, fastmath=_KERNEL_FASTMATH, boundscheck=False)
+def _frame_metrics_kernel(lm, min_visibility):
+    """
+    Compute all per-frame metrics from a (N, 4) landmark array.
     
-    knee_angles = [a for a in [metrics.knee_angle_left, metrics.knee_angle_right] if a is not None]
-    if knee_angles:
-        metrics.knee_angle_avg = sum(knee_angles) / len(knee_angles)
+    Returns a float64 array indexed like FRAME_METRIC_FIELDS, with NaN where a
+    metric could not be computed because landmarks were not visible.
+    """
+    out = np.full(_NUM_FRAME_METRICS, np.nan)
+    
+    # Landmark visibility gates
+    v_nose = lm[NOSE, 3] >= min_visibility
+    v_ls = lm[LEFT_SHOULDER, 3] >= min_visibility
+    v_rs = lm[RIGHT_SHOULDER, 3] >= min_visibility
+    v_lw = lm[LEFT_WRIST, 3] >= min_visibility
+    v_rw = lm[RIGHT_WRIST, 3] >= min_visibility
+    v_lh = lm[LEFT_HIP, 3] >= min_visibility
+    v_rh = lm[RIGHT_HIP, 3] >= min_visibility
+    v_lk = lm[LEFT_KNEE, 3] >= min_visibility
+    v_rk = lm[RIGHT_KNEE, 3] >= min_visibility
+    v_la = lm[LEFT_ANKLE, 3] >= min_visibility
+    v_ra = lm[RIGHT_ANKLE, 3] >= min_visibility
+    
+    # 1. Knee angles (individual and average)
+    if v_lh and v_lk and v_la:
+        out[_KNEE_L] = _angle_xy(lm[LEFT_HIP, 0], lm[LEFT_HIP, 1],
+                                 lm[LEFT_KNEE, 0], lm[LEFT_KNEE, 1],
+                                 lm[LEFT_ANKLE, 0], lm[LEFT_ANKLE, 1])
+    if v_rh and v_rk and v_ra:
+        out[_KNEE_R] = _angle_xy(lm[RIGHT_HIP, 0], lm[RIGHT_HIP, 1],
+                                 lm[RIGHT_KNEE, 0], lm[RIGHT_KNEE, 1],
+                                 lm[RIGHT_ANKLE, 0], lm[RIGHT_ANKLE, 1])
+    
+    has_left = not math.isnan(out[_KNEE_L])
+    has_right = not math.isnan(out[_KNEE_R])
+    if has_left and has_right:
+        out[_KNEE_AVG] = (out[_KNEE_L] + out[_KNEE_R]) / 2
+    elif has_left:
+        out[_KNEE_AVG] = out[_KNEE_L]
+    elif has_right:
+        out[_KNEE_AVG] = out[_KNEE_R]
     
     # 2. Stance width (normalized)
-    if left_ankle and right_ankle:
-        metrics.stance_width = abs(left_ankle[0] - right_ankle[0])
-        metrics.ankle_x_left = left_ankle[0]
-        metrics.ankle_x_right = right_ankle[0]
-        metrics.ankle_center_x = (left_ankle[0] + right_ankle[0]) / 2
-    
-    # 3. Hands drop (wrists below shoulders)
-    if left_shoulder and right_shoulder and left_wrist and right_wrist:
-        shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-        wrist_y = (left_wrist[1] + right_wrist[1]) / 2
-        metrics.hands_drop = wrist_y - shoulder_y  # Positive = below
-        metrics.shoulder_center_y = shoulder_y
-        
-        # Calculate wrist forward distance (how far hands extend ahead)
-        shoulder_center_x = (left_shoulder[0] + right_shoulder[0]) / 2
-        wrist_center_x = (left_wrist[0] + right_wrist[0]) / 2
-        # Forward is context-dependent; we measure absolute distance from shoulders
-        metrics.wrist_forward_dist = abs(wrist_center_x - shoulder_center_x)
-    
-    # 4. Back lean angle (angle of spine from vertical)
-    if left_shoulder and right_shoulder and left_hip and right_hip:
-        # Mid shoulder and mid hip
-        mid_shoulder = ((left_shoulder[0] + right_shoulder[0]) / 2, 
-                        (left_shoulder[1] + right_shoulder[1]) / 2)
-        mid_hip = ((left_hip[0] + right_hip[0]) / 2,
-                   (left_hip[1] + right_hip[1]) / 2)
-        
-        # Store hip y for event detection
-        metrics.hip_y_norm = mid_hip[1]
-        metrics.hip_center_y = mid_hip[1]
+    if v_la and v_ra:
+        out[_STANCE] = abs(lm[LEFT_ANKLE, 0] - lm[RIGHT_ANKLE, 0])
+        out[_ANKLE_X_L] = lm[LEFT_ANKLE, 0]
+        out[_ANKLE_X_R] = lm[RIGHT_ANKLE, 0]
+        out[_ANKLE_CX] = (lm[LEFT_ANKLE, 0] + lm[RIGHT_ANKLE, 0]) / 2
+    
+    shoulders = v_ls and v_rs
+    hips = v_lh and v_rh
+    wrists = v_lw and v_rw
+    
+    shoulder_x = (lm[LEFT_SHOULDER, 0] + lm[RIGHT_SHOULDER, 0]) / 2
+    shoulder_y = (lm[LEFT_SHOULDER, 1] + lm[RIGHT_SHOULDER, 1]) / 2
+    hip_x = (lm[LEFT_HIP, 0] + lm[RIGHT_HIP, 0]) / 2
+    hip_y = (lm[LEFT_HIP, 1] + lm[RIGHT_HIP, 1]) / 2
+    
+    if shoulders and wrists:
+        # 3. Hands drop (wrists below shoulders, positive = below)
+        wrist_x = (lm[LEFT_WRIST, 0] + lm[RIGHT_WRIST, 0]) / 2
+        wrist_y = (lm[LEFT_WRIST, 1] + lm[RIGHT_WRIST, 1]) / 2
+        out[_HANDS_DROP] = wrist_y - shoulder_y
+        out[_SHOULDER_CY] = shoulder_y
+        # How far hands extend ahead of the shoulders
+        out[_WRIST_FWD] = abs(wrist_x - shoulder_x)
         
-        # Calculate angle from vertical (straight up would be 90 degrees in our coord system)
-        # We compute angle between spine vector and vertical
-        spine_vec = (mid_shoulder[0] - mid_hip[0], mid_shoulder[1] - mid_hip[1])
-        vertical_vec = (0, -1)  # Pointing up (y decreases)
+        # 6. Elbow flare (distance of wrists from body centerline)
+        out[_FLARE_L] = abs(lm[LEFT_WRIST, 0] - shoulder_x)
+        out[_FLARE_R] = abs(lm[RIGHT_WRIST, 0] - shoulder_x)
+        out[_FLARE_AVG] = (out[_FLARE_L] + out[_FLARE_R]) / 2
+    
+    if shoulders and hips:
+        # 4. Back lean angle (angle of spine from vertical)
+        out[_HIP_Y_NORM] = hip_y
+        out[_HIP_CY] = hip_y
         
-        dot = spine_vec[0] * vertical_vec[0] + spine_vec[1] * vertical_vec[1]
-        mag_spine = math.sqrt(spine_vec[0]**2 + spine_vec[1]**2) + 1e-6
-        mag_vert = 1.0
-        
-        cos_angle = dot / (mag_spine * mag_vert)
-        cos_angle = max(-1.0, min(1.0, cos_angle))
+        spine_x = shoulder_x - hip_x
+        spine_y = shoulder_y - hip_y
+        # Dot product with the up vector (0, -1)
+        dot = -spine_y
+        mag_spine = math.sqrt(spine_x * spine_x + spine_y * spine_y) + 1e-6
+        cos_angle = max(-1.0, min(1.0, dot / mag_spine))
         angle_from_vertical = math.degrees(math.acos(cos_angle))
         
-        # Back lean: 0 = perfectly upright, positive = leaning forward, negative could indicate leaning back
-        # Since we want to detect "leaning back too much", we'll track the raw angle
-        metrics.back_lean_angle = angle_from_vertical
+        out[_BACK_LEAN] = angle_from_vertical
+        out[_TORSO] = angle_from_vertical
         
-        # Also compute torso angle (different from spine - measures bend at waist)
-        # This checks if chest is up vs bent at waist
-        metrics.torso_angle = angle_from_vertical
-    
-    # 5. Hip height ratio (how low are hips relative to shoulders)
-    if left_hip and right_hip and left_shoulder and right_shoulder:
-        hip_y = (left_hip[1] + right_hip[1]) / 2
-        shoulder_y = (left_shoulder[1] + right_shoulder[1]) / 2
-        # Higher ratio = hips closer to shoulders (more bent)
-        # In normalized coords, y increases downward
+        # 5. Hip height ratio (how low are hips relative to shoulders)
         if shoulder_y > 0.01:  # Avoid division by zero
-            metrics.hip_height_ratio = (hip_y - shoulder_y) / (1 - shoulder_y + 0.01)
+            out[_HIP_RATIO] = (hip_y - shoulder_y) / (1 - shoulder_y + 0.01)
+    
+    # 7. Head position (nose relative to hips)
+    if v_nose and hips:
+        out[_HEAD_POS] = lm[NOSE, 0] - hip_x
+        out[_HEAD_Y_REL] = hip_y - lm[NOSE, 1]  # Positive = head above hips (good)
+    
+    # 8. Lead/trail leg - the leg with the higher ankle (lower y) leads
+    if has_left and has_right and v_la and v_ra:
+        if lm[LEFT_ANKLE, 1] < lm[RIGHT_ANKLE, 1]:
+            out[_LEAD_KNEE] = out[_KNEE_L]
+            out[_REAR_KNEE] = out[_KNEE_R]
+        else:
+            out[_LEAD_KNEE] = out[_KNEE_R]
+            out[_REAR_KNEE] = out[_KNEE_L]
     
-    # 6. Elbow flare (how far elbows/wrists are from body centerline)
-    if left_shoulder and right_shoulder and left_wrist and right_wrist:
-        center_x = (left_shoulder[0] + right_shoulder[0]) / 2
-        
-        # Distance of wrists from centerline
-        metrics.elbow_flare_left = abs(left_wrist[0] - center_x)
-        metrics.elbow_flare_right = abs(right_wrist[0] - center_x)
-        metrics.elbow_flare_avg = (metrics.elbow_flare_left + metrics.elbow_flare_right) / 2
-    
-    # 7. Head position (nose relative to hips - is head forward?)
-    if nose and left_hip and right_hip:
-        hip_center_x = (left_hip[0] + right_hip[0]) / 2
-        hip_center_y = (left_hip[1] + right_hip[1]) / 2
-        # Positive = head forward of hips
-        metrics.head_position = nose[0] - hip_center_x
-        # Also track vertical: positive means head above hips (normal), negative means head below/behind
-        metrics.head_y_relative = hip_center_y - nose[1]  # Positive = head above hips (good)
-    
-    # 8. Lead/trail leg angles for shot analysis
-    # Determine which leg is forward (lower x value in typical side view, or lower ankle y)
-    if metrics.knee_angle_left is not None and metrics.knee_angle_right is not None:
-        if left_ankle and right_ankle:
-            # The leg with lower ankle y (higher on screen, more forward in lunge) is the lead
-            if left_ankle[1] < right_ankle[1]:
-                metrics.lead_knee_angle = metrics.knee_angle_left
-                metrics.rear_knee_angle = metrics.knee_angle_right
-            else:
-                metrics.lead_knee_angle = metrics.knee_angle_right
-                metrics.rear_knee_angle = metrics.knee_angle_left
+    return out
+
+
+@njit(cache=True, nogil=True, boundscheck=False)
+def _series_metrics_kernel(series, min_visibility):
+    """Run _frame_metrics_kernel over an (F, N, 4) stack of landmark arrays."""
+    out = np.empty((series.shape[0], _NUM_FRAME_METRICS))
+    for i in range(series.shape[0]):
+        out[i] = _frame_metrics_kernel(series[i], min_visibility)
+    return out
+
+
+def warm_frame_metrics_kernel():
+    """Compile (or load from cache) the metrics kernels before the first real frame."""
+    _frame_metrics_kernel(np.zeros((RIGHT_ANKLE + 1, 4)), 0.5)
+    _series_metrics_kernel(np.zeros((1, RIGHT_ANKLE + 1, 4)), 0.5)
+
+
+def metrics_from_array(values: np.ndarray, timestamp: float = 0.0) -> FrameMetrics:
+    """Build a FrameMetrics from a kernel output array (NaN -> None)."""
+    args = [None if math.isnan(value) else value for value in values.tolist()]
+    args.insert(_TIMESTAMP_ARG, timestamp)
+    return FrameMetrics(*args, values=values)
+
+
+def analyze_frame_landmarks(landmarks, timestamp: float = 0.0, min_visibility: float = 0.5) -> FrameMetrics:
+    """
+    Analyze a single frame's pose landmarks.
+    Returns comprehensive metrics including event detection data.
+    
+    Landmarks are copied into one array (unless already given as one, see
+    landmarks_to_array) and the geometry runs in a Numba-compiled kernel
+    (plain Python if Numba is not installed). Arrays are normalized to
+    C-contiguous float64 so every call hits the signature compiled by
+    warm_frame_metrics_kernel instead of triggering a new compile.
+    """
+    if not isinstance(landmarks, np.ndarray):
+        landmarks = landmarks_to_array(landmarks)
+    landmarks = np.ascontiguousarray(landmarks, dtype=np.float64)
+    values = _frame_metrics_kernel(landmarks, min_visibility)
+    return metrics_from_array(values, timestamp)
+
+
+def analyze_landmark_series(
+    landmarks: List[np.ndarray],
+    timestamps: List[float],
+    min_visibility: float = 0.5
+) -> List[FrameMetrics]:
+    """
+    Analyze a clip's sampled poses in one kernel call.
+    
+    The analysis loops only collect (N, 4) frame landmark arrays; stacking
+    them and computing every frame's metrics at once replaces a
+    Python -> kernel round trip (and a result array) per frame.
     
-    return metrics
+    Args:
+        landmarks: Frame landmark arrays (see landmarks_to_frame_array)
+        timestamps: Timestamp in seconds of each landmark array
+    
+    Returns:
+        FrameMetrics per sample, in order
+    """
+    if not landmarks:
+        return []
+    series = np.ascontiguousarray(np.stack(landmarks), dtype=np.float64)
+    matrix = _series_metrics_kernel(series, min_visibility)
+    return [metrics_from_array(row, timestamp) for row, timestamp in zip(matrix, timestamps)]
+
+
+def metrics_matrix(frame_metrics: List[FrameMetrics]) -> np.ndarray:
+    """
+    Stack per-frame metrics into one (N, len(FRAME_METRIC_FIELDS)) float64 array.
+    
+    Frames produced by the metrics kernel already carry their row, so this is
+    a single np.stack; other frames are filled from their attributes.
+    Missing values are NaN.
+    """
+    if not frame_metrics:
+        return np.empty((0, _NUM_FRAME_METRICS), dtype=np.float64)
+    
+    if all(m.values is not None for m in frame_metrics):
+        return np.stack([m.values for m in frame_metrics])
+    
+    matrix = np.full((len(frame_metrics), _NUM_FRAME_METRICS), np.nan)
+    for row, m in zip(matrix, frame_metrics):
+        if m.values is not None:
+            row[:] = m.values
+            continue
+        for col, name in enumerate(FRAME_METRIC_FIELDS):
+            value = getattr(m, name)
+            if value is not None:
+                row[col] = value
+    return matrix
+
+
+def collect_metric_arrays(frame_metrics: List[FrameMetrics], fields: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """
+    Gather the non-None values of several FrameMetrics fields into numpy arrays.
+    
+    Builds the columnar metrics matrix once and slices each field's column,
+    dropping the NaN (missing) entries.
+    
+    Returns:
+        Dict mapping field name -> 1-D float64 array of the present values
+    """
+    matrix = metrics_matrix(frame_metrics)
+    values = {}
+    for name in fields:
+        column = matrix[:, FRAME_METRIC_INDEX[name]]
+        values[name] = column[~np.isnan(column)]
+    return values
+
+
+# FrameMetrics fields summarized by compute_aggregate_metrics
+# (torso_angle is the same spine angle as back_lean_angle, so it isn't collected twice)
+AGGREGATE_FIELDS = (
+    "knee_angle_avg", "stance_width", "hands_drop", "back_lean_angle",
+    "hip_height_ratio", "elbow_flare_avg", "head_position",
+    "head_y_relative", "wrist_forward_dist", "ankle_center_x",
+    "rear_knee_angle", "lead_knee_angle",
+)
 
 
 def compute_aggregate_metrics(frame_metrics: List[FrameMetrics]) -> Dict:
@@ -402,47 +1046,62 @@ def compute_aggregate_metrics(frame_metrics: List[FrameMetrics]) -> Dict:
         return {}
     
     # Helper to aggregate a metric - ensures native Python types
-    def aggregate(values: List[float]) -> Dict:
-        if not values:
+    def aggregate(values: np.ndarray) -> Dict:
+        if values.size == 0:
             return {"avg": None, "min": None, "max": None, "count": 0}
         return {
-            "avg": float(round(sum(values) / len(values), 2)),
-            "min": float(round(min(values), 2)),
-            "max": float(round(max(values), 2)),
-            "count": len(values)
+            "avg": float(round(float(values.mean()), 2)),
+            "min": float(round(float(values.min()), 2)),
+            "max": float(round(float(values.max()), 2)),
+            "count": int(values.size)
         }
     
+    # Helper for population variance (0.0 for fewer than two values).
+    # Centred sum of squares via one BLAS dot; the one-pass
+    # sum(x^2)/n - mean^2 form cancels badly for angles around 140 degrees.
+    def variance(values: np.ndarray) -> float:
+        if values.size < 2:
+            return 0.0
+        centred = values - values.mean()
+        return float(np.dot(centred, centred)) / values.size
+    
+    # Helper for the percentage of values matching a threshold mask
+    def pct(mask: np.ndarray) -> float:
+        return float(np.count_nonzero(mask)) / mask.size * 100 if mask.size else 0
+    
     # Extract values
-    knee_angles = [m.knee_angle_avg for m in frame_metrics if m.knee_angle_avg is not None]
-    stance_widths = [m.stance_width for m in frame_metrics if m.stance_width is not None]
-    hands_drops = [m.hands_drop for m in frame_metrics if m.hands_drop is not None]
-    back_leans = [m.back_lean_angle for m in frame_metrics if m.back_lean_angle is not None]
-    hip_ratios = [m.hip_height_ratio for m in frame_metrics if m.hip_height_ratio is not None]
-    elbow_flares = [m.elbow_flare_avg for m in frame_metrics if m.elbow_flare_avg is not None]
-    head_positions = [m.head_position for m in frame_metrics if m.head_position is not None]
+    values = collect_metric_arrays(frame_metrics, AGGREGATE_FIELDS)
+    knee_angles = values["knee_angle_avg"]
+    stance_widths = values["stance_width"]
+    hands_drops = values["hands_drop"]
+    back_leans = values["back_lean_angle"]
+    hip_ratios = values["hip_height_ratio"]
+    elbow_flares = values["elbow_flare_avg"]
+    head_positions = values["head_position"]
     
     # Additional metrics for expanded analysis
-    torso_angles = [m.torso_angle for m in frame_metrics if m.torso_angle is not None]
-    head_y_relatives = [m.head_y_relative for m in frame_metrics if m.head_y_relative is not None]
-    wrist_forward_dists = [m.wrist_forward_dist for m in frame_metrics if m.wrist_forward_dist is not None]
-    ankle_center_xs = [m.ankle_center_x for m in frame_metrics if m.ankle_center_x is not None]
-    rear_knee_angles = [m.rear_knee_angle for m in frame_metrics if m.rear_knee_angle is not None]
-    lead_knee_angles = [m.lead_knee_angle for m in frame_metrics if m.lead_knee_angle is not None]
+    torso_angles = back_leans
+    head_y_relatives = values["head_y_relative"]
+    wrist_forward_dists = values["wrist_forward_dist"]
+    ankle_center_xs = values["ankle_center_x"]
+    rear_knee_angles = values["rear_knee_angle"]
+    lead_knee_angles = values["lead_knee_angle"]
     
     # Calculate percentages of frames exceeding thresholds
-    pct_knee_high = (len([k for k in knee_angles if k > KNEE_ANGLE_THRESHOLD]) / len(knee_angles) * 100) if knee_angles else 0
-    pct_stance_narrow = (len([s for s in stance_widths if s < STANCE_WIDTH_THRESHOLD]) / len(stance_widths) * 100) if stance_widths else 0
-    pct_hands_dropped = (len([h for h in hands_drops if h > HANDS_DROP_THRESHOLD]) / len(hands_drops) * 100) if hands_drops else 0
-    pct_back_lean = (len([b for b in back_leans if b > 25]) / len(back_leans) * 100) if back_leans else 0  # >25 degrees from vertical
+    pct_knee_high = pct(knee_angles > KNEE_ANGLE_THRESHOLD)
+    pct_stance_narrow = pct(stance_widths < STANCE_WIDTH_THRESHOLD)
+    pct_hands_dropped = pct(hands_drops > HANDS_DROP_THRESHOLD)
+    pct_back_lean = pct(back_leans > 25)  # >25 degrees from vertical
+    back_lean_summary = aggregate(back_leans)
     
     # New percentages
-    pct_torso_bent = (len([t for t in torso_angles if t > TORSO_ANGLE_TOO_BENT]) / len(torso_angles) * 100) if torso_angles else 0
-    pct_head_behind = (len([h for h in head_y_relatives if h < HEAD_BEHIND_HIPS_THRESHOLD]) / len(head_y_relatives) * 100) if head_y_relatives else 0
-    pct_reaching = (len([w for w in wrist_forward_dists if w > REACHING_THRESHOLD]) / len(wrist_forward_dists) * 100) if wrist_forward_dists else 0
+    pct_torso_bent = pct(torso_angles > TORSO_ANGLE_TOO_BENT)
+    pct_head_behind = pct(head_y_relatives < HEAD_BEHIND_HIPS_THRESHOLD)
+    pct_reaching = pct(wrist_forward_dists > REACHING_THRESHOLD)
     
     # Calculate lateral motion variance (how much you move side to side)
     # Convert to float to ensure native Python type
-    lateral_variance = float(np.var(ankle_center_xs)) if len(ankle_center_xs) > 1 else 0.0
+    lateral_variance = variance(ankle_center_xs)
     
     return {
         "knee_angle": {
@@ -461,7 +1120,7 @@ def compute_aggregate_metrics(frame_metrics: List[FrameMetrics]) -> Dict:
             "pct_above_threshold": round(pct_hands_dropped, 1)
         },
         "back_lean_angle": {
-            **aggregate(back_leans),
+            **back_lean_summary,
             "pct_excessive": round(pct_back_lean, 1)
         },
         "hip_height_ratio": aggregate(hip_ratios),
@@ -472,12 +1131,12 @@ def compute_aggregate_metrics(frame_metrics: List[FrameMetrics]) -> Dict:
         "head_position": aggregate(head_positions),
         "frames_analyzed": len(frame_metrics),
         "motion_stability": {
-            "knee_variance": round(float(np.var(knee_angles)), 2) if len(knee_angles) > 1 else 0.0,
-            "stance_variance": round(float(np.var(stance_widths)), 4) if len(stance_widths) > 1 else 0.0
+            "knee_variance": round(variance(knee_angles), 2),
+            "stance_variance": round(variance(stance_widths), 4)
         },
         # Extended metrics
         "torso_angle": {
-            **aggregate(torso_angles),
+            **back_lean_summary,
             "threshold": TORSO_ANGLE_TOO_BENT,
             "pct_too_bent": round(pct_torso_bent, 1)
         },
@@ -512,39 +1171,27 @@ def detect_timeline_events(
     min_frames = int(min_duration * fps)
     
     # Track consecutive bad frames for each metric
-    def detect_runs(values_with_timestamps: List[Tuple[float, float]], 
+    def detect_runs(timestamps: np.ndarray,
+                    values: np.ndarray,
                     threshold: float, 
                     above: bool,
                     metric_name: str,
                     message_template: str) -> List[Dict]:
         """Detect runs of consecutive frames exceeding threshold."""
         runs = []
-        current_run = []
+        bad = (values > threshold) if above else (values < threshold)
         
-        for timestamp, value in values_with_timestamps:
-            is_bad = (value > threshold) if above else (value < threshold)
-            
-            if is_bad:
-                current_run.append((timestamp, value))
-            else:
-                if len(current_run) >= min_frames:
-                    start_time = current_run[0][0]
-                    end_time = current_run[-1][0]
-                    avg_value = sum(v for _, v in current_run) / len(current_run)
-                    runs.append({
-                        "timestamp": float(round(start_time, 2)),
-                        "duration": float(round(end_time - start_time, 2)),
-                        "metric": metric_name,
-                        "value": float(round(avg_value, 2)),
-                        "message": message_template.format(value=round(avg_value, 1))
-                    })
-                current_run = []
+        # Run boundaries: +1 where a bad run starts, -1 one past where it ends
+        edges = np.diff(np.concatenate(([0], bad.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
         
-        # Check final run
-        if len(current_run) >= min_frames:
-            start_time = current_run[0][0]
-            end_time = current_run[-1][0]
-            avg_value = sum(v for _, v in current_run) / len(current_run)
+        for run_start, run_end in zip(starts.tolist(), ends.tolist()):
+            if run_end - run_start < min_frames:
+                continue
+            start_time = float(timestamps[run_start])
+            end_time = float(timestamps[run_end - 1])
+            avg_value = float(values[run_start:run_end].mean())
             runs.append({
                 "timestamp": float(round(start_time, 2)),
                 "duration": float(round(end_time - start_time, 2)),
@@ -555,20 +1202,28 @@ def detect_timeline_events(
         
         return runs
     
-    # Extract timestamped values
-    knee_vals = [(m.timestamp, m.knee_angle_avg) for m in frame_metrics if m.knee_angle_avg is not None]
-    stance_vals = [(m.timestamp, m.stance_width) for m in frame_metrics if m.stance_width is not None]
-    hands_vals = [(m.timestamp, m.hands_drop) for m in frame_metrics if m.hands_drop is not None]
-    lean_vals = [(m.timestamp, m.back_lean_angle) for m in frame_metrics if m.back_lean_angle is not None]
+    # Extract timestamped values (frames where the metric is present)
+    matrix = metrics_matrix(frame_metrics)
+    all_timestamps = np.fromiter((m.timestamp for m in frame_metrics), dtype=np.float64, count=len(frame_metrics))
+    
+    def timestamped(name: str) -> Tuple[np.ndarray, np.ndarray]:
+        column = matrix[:, FRAME_METRIC_INDEX[name]]
+        present = ~np.isnan(column)
+        return all_timestamps[present], column[present]
+    
+    knee_vals = timestamped("knee_angle_avg")
+    stance_vals = timestamped("stance_width")
+    hands_vals = timestamped("hands_drop")
+    lean_vals = timestamped("back_lean_angle")
     
     # Detect events
-    events.extend(detect_runs(knee_vals, KNEE_ANGLE_THRESHOLD, True, "knee_angle", 
+    events.extend(detect_runs(*knee_vals, KNEE_ANGLE_THRESHOLD, True, "knee_angle", 
                               "Standing too upright (avg {value}°)"))
-    events.extend(detect_runs(stance_vals, STANCE_WIDTH_THRESHOLD, False, "stance_width",
+    events.extend(detect_runs(*stance_vals, STANCE_WIDTH_THRESHOLD, False, "stance_width",
                               "Narrow stance ({value})"))
-    events.extend(detect_runs(hands_vals, HANDS_DROP_THRESHOLD, True, "hands_drop",
+    events.extend(detect_runs(*hands_vals, HANDS_DROP_THRESHOLD, True, "hands_drop",
                               "Hands dropping ({value})"))
-    events.extend(detect_runs(lean_vals, 25, True, "back_lean",
+    events.extend(detect_runs(*lean_vals, 25, True, "back_lean",
                               "Excessive lean ({value}°)"))
     
     # Sort by timestamp
@@ -594,7 +1249,7 @@ def detect_inactive_frames(
     Args:
         frame_metrics: List of per-frame metrics
         fps: Video frames per second
-        
+    
     Returns:
         Tuple of:
         - List of inactive frame indices
@@ -604,51 +1259,32 @@ def detect_inactive_frames(
     if not frame_metrics:
         return [], 0.0, 100.0
     
-    inactive_indices = []
     min_consecutive = max(3, int(fps * 0.3))  # At least 0.3 seconds
     
-    # First pass: mark potentially inactive frames
-    potential_inactive = []
-    for i, m in enumerate(frame_metrics):
-        is_inactive = False
-        
-        # Check knee angle (very straight = standing)
-        knee_check = False
-        if m.knee_angle_avg is not None and m.knee_angle_avg > INACTIVE_KNEE_ANGLE_THRESHOLD:
-            knee_check = True
-        
-        # Check hip-shoulder ratio (upright posture)
-        posture_check = False
-        if m.hip_height_ratio is not None and m.hip_height_ratio < INACTIVE_HIP_SHOULDER_RATIO:
-            posture_check = True
-        
-        # Check torso angle (minimal forward lean)
-        lean_check = False
-        if m.torso_angle is not None and m.torso_angle < INACTIVE_TORSO_ANGLE_MAX:
-            lean_check = True
-        
-        # Need at least 2 of 3 conditions to be potentially inactive
-        conditions_met = sum([knee_check, posture_check, lean_check])
-        if conditions_met >= 2:
-            potential_inactive.append(i)
-    
-    # Second pass: only mark as inactive if part of consecutive run
-    if len(potential_inactive) > 0:
-        current_run = [potential_inactive[0]]
-        
-        for i in range(1, len(potential_inactive)):
-            if potential_inactive[i] == potential_inactive[i-1] + 1:
-                # Consecutive frame
-                current_run.append(potential_inactive[i])
-            else:
-                # Run ended - check if long enough
-                if len(current_run) >= min_consecutive:
-                    inactive_indices.extend(current_run)
-                current_run = [potential_inactive[i]]
-        
-        # Check final run
-        if len(current_run) >= min_consecutive:
-            inactive_indices.extend(current_run)
+    # First pass: mark potentially inactive frames, one column at a time
+    # (missing metrics are NaN, which fails every comparison)
+    matrix = metrics_matrix(frame_metrics)
+    with np.errstate(invalid="ignore"):
+        # Very straight knees = standing
+        knee_check = matrix[:, FRAME_METRIC_INDEX["knee_angle_avg"]] > INACTIVE_KNEE_ANGLE_THRESHOLD
+        # Upright posture (hip-shoulder ratio)
+        posture_check = matrix[:, FRAME_METRIC_INDEX["hip_height_ratio"]] < INACTIVE_HIP_SHOULDER_RATIO
+        # Minimal forward lean
+        lean_check = matrix[:, FRAME_METRIC_INDEX["torso_angle"]] < INACTIVE_TORSO_ANGLE_MAX
+    
+    # Need at least 2 of 3 conditions to be potentially inactive
+    potential_inactive = (knee_check.view(np.int8) + posture_check.view(np.int8) + lean_check.view(np.int8)) >= 2
+    
+    # Second pass: only mark as inactive if part of a long enough consecutive run
+    edges = np.diff(np.concatenate(([0], potential_inactive.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    inactive_indices = [
+        i
+        for run_start, run_end in zip(starts.tolist(), ends.tolist())
+        if run_end - run_start >= min_consecutive
+        for i in range(run_start, run_end)
+    ]
     
     # Calculate percentages
     total_frames = len(frame_metrics)
@@ -671,7 +1307,7 @@ def filter_metrics_for_analysis(
     Args:
         frame_metrics: Full list of frame metrics
         inactive_indices: Indices of inactive frames to exclude
-        
+    
     Returns:
         Filtered list of frame metrics (active frames only)
     """
@@ -681,12 +1317,19 @@ def filter_metrics_for_analysis(
 
 def detect_wrestling_events(
     frame_metrics: List[FrameMetrics],
-    fps: float
+    fps: float,
+    frames_per_sample: int = 1
 ) -> List[Dict]:
     """
     Detect wrestling-specific events like level changes, shot attempts, and sprawls.
     Uses pose metric trends over sliding windows.
     
+    Args:
+        frame_metrics: Per-sample metrics
+        fps: Rate of the metric samples (video fps / pose stride)
+        frames_per_sample: Video frames between consecutive samples (the pose
+            stride); change rates are per video frame, as the thresholds are
+    
     Returns:
         List of events: {type, t_start, t_end, confidence, description}
     """
@@ -695,176 +1338,123 @@ def detect_wrestling_events(
     if len(frame_metrics) < 5:
         return events
     
-    # Window sizes (in frames)
+    # Window sizes (in samples)
     window_size = max(3, int(fps * 0.2))  # ~0.2 seconds
+    # Video frames spanned by one window, for per-frame change rates
+    window_frames = window_size * max(1, int(frames_per_sample))
+    num_frames = len(frame_metrics)
     
-    # Extract time series data
+    # Extract time series data (columns of the metrics matrix, NaN = missing)
+    matrix = metrics_matrix(frame_metrics)
     timestamps = [m.timestamp for m in frame_metrics]
-    hip_y_values = [m.hip_y_norm for m in frame_metrics]
-    knee_values = [m.knee_angle_avg for m in frame_metrics]
-    ankle_x_values = [m.ankle_center_x for m in frame_metrics]
-    stance_values = [m.stance_width for m in frame_metrics]
-    torso_values = [m.torso_angle for m in frame_metrics]
-    
-    # Helper: compute derivative (change rate)
-    def compute_derivative(values: List, window: int = 3) -> List[float]:
-        """Compute rate of change over window."""
-        derivatives = [0.0] * len(values)
-        for i in range(window, len(values)):
-            if values[i] is not None and values[i - window] is not None:
-                derivatives[i] = (values[i] - values[i - window]) / window
-            else:
-                derivatives[i] = 0.0
-        return derivatives
     
-    # Compute derivatives
-    hip_y_deriv = compute_derivative(hip_y_values, window_size)
-    knee_deriv = compute_derivative(knee_values, window_size)
-    ankle_x_deriv = compute_derivative(ankle_x_values, window_size)  # Forward velocity proxy
-    
-    # Track event windows to avoid duplicates
-    used_frames = set()
+    def column(name: str, missing: Optional[float] = None) -> np.ndarray:
+        values = matrix[:, FRAME_METRIC_INDEX[name]]
+        return values if missing is None else np.where(np.isnan(values), missing, values)
+    
+    # Helper: change over `lag` frames (0 for the first `lag` frames and where a value is missing)
+    def lagged_change(values: np.ndarray, lag: int) -> np.ndarray:
+        change = np.zeros(num_frames)
+        change[lag:] = values[lag:] - values[:num_frames - lag]
+        change[np.isnan(change)] = 0.0
+        return change
+    
+    # Compute derivatives (change rate per video frame)
+    hip_y_deriv = lagged_change(column("hip_y_norm"), window_size) / window_frames
+    knee_deriv = lagged_change(column("knee_angle_avg"), window_size) / window_frames
+    ankle_x_deriv = lagged_change(column("ankle_center_x"), window_size) / window_frames  # Forward velocity proxy
+    stance_values = column("stance_width", missing=0.2)
+    torso_values = column("torso_angle", missing=0.0)
+    
+    # Candidate frames in [first, num_frames - window_size), skipping frames inside
+    # the window of the previous event of the same type (windows only move forward)
+    def event_windows(mask: np.ndarray, first: int, lookback: int):
+        last_end = -1
+        for i in (np.flatnonzero(mask[first:num_frames - window_size]) + first).tolist():
+            if i <= last_end:
+                continue
+            start_idx = max(0, i - lookback)
+            end_idx = min(num_frames - 1, i + window_size)
+            last_end = end_idx
+            yield i, start_idx, end_idx
     
     # 1. Detect LEVEL_CHANGE events
     # Criteria: rapid hip drop + significant knee bend increase
-    for i in range(window_size, len(frame_metrics) - window_size):
-        if i in used_frames:
-            continue
-            
-        hip_drop = hip_y_deriv[i] if hip_y_deriv[i] is not None else 0
-        knee_change = knee_deriv[i] if knee_deriv[i] is not None else 0
+    # Hip y increases (drops in image coords) and knee angle decreases (bending)
+    is_level_change = (
+        (hip_y_deriv > LEVEL_CHANGE_HIP_DROP_THRESHOLD) &
+        (knee_deriv < -2)  # Knee angle decreasing (more bent)
+    )
+    for i, start_idx, end_idx in event_windows(is_level_change, window_size, window_size):
+        hip_drop = float(hip_y_deriv[i])
+        knee_change = float(knee_deriv[i])
         
-        # Hip y increases (drops in image coords) and knee angle decreases (bending)
-        is_level_change = (
-            hip_drop > LEVEL_CHANGE_HIP_DROP_THRESHOLD and 
-            knee_change < -2  # Knee angle decreasing (more bent)
-        )
+        # Calculate confidence based on magnitude
+        hip_magnitude = abs(hip_drop) / LEVEL_CHANGE_HIP_DROP_THRESHOLD
+        knee_magnitude = abs(knee_change) / LEVEL_CHANGE_KNEE_BEND_INCREASE if LEVEL_CHANGE_KNEE_BEND_INCREASE else 1
+        confidence = min(1.0, (hip_magnitude + knee_magnitude) / 2)
         
-        if is_level_change:
-            # Find event boundaries
-            start_idx = max(0, i - window_size)
-            end_idx = min(len(frame_metrics) - 1, i + window_size)
-            
-            t_start = timestamps[start_idx]
-            t_end = timestamps[end_idx]
-            
-            # Calculate confidence based on magnitude
-            hip_magnitude = abs(hip_drop) / LEVEL_CHANGE_HIP_DROP_THRESHOLD
-            knee_magnitude = abs(knee_change) / LEVEL_CHANGE_KNEE_BEND_INCREASE if LEVEL_CHANGE_KNEE_BEND_INCREASE else 1
-            confidence = min(1.0, (hip_magnitude + knee_magnitude) / 2)
-            
-            events.append({
-                "type": "LEVEL_CHANGE",
-                "t_start": float(round(t_start, 2)),
-                "t_end": float(round(t_end, 2)),
-                "confidence": float(round(confidence, 2)),
-                "description": "Level change detected - hip dropped rapidly with knee bend increase"
-            })
-            
-            # Mark frames as used
-            for j in range(start_idx, end_idx + 1):
-                used_frames.add(j)
+        events.append({
+            "type": "LEVEL_CHANGE",
+            "t_start": float(round(timestamps[start_idx], 2)),
+            "t_end": float(round(timestamps[end_idx], 2)),
+            "confidence": float(round(confidence, 2)),
+            "description": "Level change detected - hip dropped rapidly with knee bend increase"
+        })
     
     # 2. Detect SHOT_ATTEMPT events
     # Criteria: level change + forward drive (ankle x change) + stance narrows
-    used_frames_shot = set()
-    for i in range(window_size * 2, len(frame_metrics) - window_size):
-        if i in used_frames_shot:
-            continue
-            
-        hip_drop = hip_y_deriv[i] if hip_y_deriv[i] is not None else 0
-        forward_vel = ankle_x_deriv[i] if ankle_x_deriv[i] is not None else 0
-        
-        # Check stance narrowing (indicates penetration step)
-        stance_now = stance_values[i] if stance_values[i] is not None else 0.2
-        stance_before = stance_values[max(0, i - window_size * 2)] if stance_values[max(0, i - window_size * 2)] is not None else 0.2
-        stance_change = stance_now - stance_before
-        
-        # Check torso angle change (leans forward during shot)
-        torso_now = torso_values[i] if torso_values[i] is not None else 0
-        torso_before = torso_values[max(0, i - window_size)] if torso_values[max(0, i - window_size)] is not None else 0
-        torso_increase = torso_now - torso_before
+    # (penetration step) or torso leans forward
+    stance_change = lagged_change(stance_values, window_size * 2)
+    torso_increase = lagged_change(torso_values, window_size)
+    is_shot = (
+        (hip_y_deriv > LEVEL_CHANGE_HIP_DROP_THRESHOLD * 0.8) &  # Level change component
+        (np.abs(ankle_x_deriv) > SHOT_FORWARD_VELOCITY_THRESHOLD) &  # Forward drive
+        ((stance_change < -0.02) | (torso_increase > 5))  # Either stance narrows or torso leans
+    )
+    for i, start_idx, end_idx in event_windows(is_shot, window_size * 2, window_size * 2):
+        hip_drop = float(hip_y_deriv[i])
+        forward_vel = float(ankle_x_deriv[i])
         
-        is_shot = (
-            hip_drop > LEVEL_CHANGE_HIP_DROP_THRESHOLD * 0.8 and  # Level change component
-            abs(forward_vel) > SHOT_FORWARD_VELOCITY_THRESHOLD and  # Forward drive
-            (stance_change < -0.02 or torso_increase > 5)  # Either stance narrows or torso leans
-        )
+        # Confidence based on multiple factors
+        confidence = min(1.0, (
+            abs(hip_drop) / LEVEL_CHANGE_HIP_DROP_THRESHOLD * 0.4 +
+            abs(forward_vel) / SHOT_FORWARD_VELOCITY_THRESHOLD * 0.3 +
+            0.3  # Base confidence
+        ))
         
-        if is_shot:
-            start_idx = max(0, i - window_size * 2)
-            end_idx = min(len(frame_metrics) - 1, i + window_size)
-            
-            t_start = timestamps[start_idx]
-            t_end = timestamps[end_idx]
-            
-            # Confidence based on multiple factors
-            confidence = min(1.0, (
-                abs(hip_drop) / LEVEL_CHANGE_HIP_DROP_THRESHOLD * 0.4 +
-                abs(forward_vel) / SHOT_FORWARD_VELOCITY_THRESHOLD * 0.3 +
-                0.3  # Base confidence
-            ))
-            
-            events.append({
-                "type": "SHOT_ATTEMPT",
-                "t_start": float(round(t_start, 2)),
-                "t_end": float(round(t_end, 2)),
-                "confidence": float(round(confidence, 2)),
-                "description": "Shot attempt detected - level change with forward penetration"
-            })
-            
-            for j in range(start_idx, end_idx + 1):
-                used_frames_shot.add(j)
+        events.append({
+            "type": "SHOT_ATTEMPT",
+            "t_start": float(round(timestamps[start_idx], 2)),
+            "t_end": float(round(timestamps[end_idx], 2)),
+            "confidence": float(round(confidence, 2)),
+            "description": "Shot attempt detected - level change with forward penetration"
+        })
     
     # 3. Detect SPRAWL_DEFENSE events
-    # Criteria: hip drop + backward leg extension / wide stance + torso stays up or leans back
-    used_frames_sprawl = set()
-    for i in range(window_size, len(frame_metrics) - window_size):
-        if i in used_frames_sprawl:
-            continue
-            
-        hip_drop = hip_y_deriv[i] if hip_y_deriv[i] is not None else 0
-        
-        # Check stance widening (spreading legs for sprawl)
-        stance_now = stance_values[i] if stance_values[i] is not None else 0.2
-        stance_before = stance_values[max(0, i - window_size)] if stance_values[max(0, i - window_size)] is not None else 0.2
-        stance_widening = stance_now - stance_before
-        
-        # Check for backward movement or stable position (not forward like a shot)
-        forward_vel = ankle_x_deriv[i] if ankle_x_deriv[i] is not None else 0
-        
-        # Torso should stay relatively upright or lean back slightly
-        torso_now = torso_values[i] if torso_values[i] is not None else 0
+    # Criteria: hip drop + legs spreading, without driving forward like a shot
+    stance_widening = lagged_change(stance_values, window_size)
+    is_sprawl = (
+        (hip_y_deriv > SPRAWL_HIP_DROP_THRESHOLD) &  # Hips dropping
+        (stance_widening > 0.03) &  # Legs spreading
+        (ankle_x_deriv < SHOT_FORWARD_VELOCITY_THRESHOLD * 0.5)  # Not driving forward
+    )
+    for i, start_idx, end_idx in event_windows(is_sprawl, window_size, window_size):
+        hip_drop = float(hip_y_deriv[i])
         
-        is_sprawl = (
-            hip_drop > SPRAWL_HIP_DROP_THRESHOLD and  # Hips dropping
-            stance_widening > 0.03 and  # Legs spreading
-            forward_vel < SHOT_FORWARD_VELOCITY_THRESHOLD * 0.5  # Not driving forward
-        )
+        confidence = min(1.0, (
+            abs(hip_drop) / SPRAWL_HIP_DROP_THRESHOLD * 0.4 +
+            float(stance_widening[i]) / 0.05 * 0.3 +
+            0.3
+        ))
         
-        if is_sprawl:
-            start_idx = max(0, i - window_size)
-            end_idx = min(len(frame_metrics) - 1, i + window_size)
-            
-            t_start = timestamps[start_idx]
-            t_end = timestamps[end_idx]
-            
-            confidence = min(1.0, (
-                abs(hip_drop) / SPRAWL_HIP_DROP_THRESHOLD * 0.4 +
-                stance_widening / 0.05 * 0.3 +
-                0.3
-            ))
-            
-            events.append({
-                "type": "SPRAWL_DEFENSE",
-                "t_start": float(round(t_start, 2)),
-                "t_end": float(round(t_end, 2)),
-                "confidence": float(round(confidence, 2)),
-                "description": "Sprawl defense detected - hip drop with leg extension"
-            })
-            
-            for j in range(start_idx, end_idx + 1):
-                used_frames_sprawl.add(j)
+        events.append({
+            "type": "SPRAWL_DEFENSE",
+            "t_start": float(round(timestamps[start_idx], 2)),
+            "t_end": float(round(timestamps[end_idx], 2)),
+            "confidence": float(round(confidence, 2)),
+            "description": "Sprawl defense detected - hip drop with leg extension"
+        })
     
     # Sort by timestamp and remove very low confidence events
     events = [e for e in events if e["confidence"] >= 0.3]
@@ -873,6 +1463,117 @@ def detect_wrestling_events(
     return events
 
 
+# Severity weights for ranking coaching pointers
+SEVERITY_WEIGHTS = {
+    "knee_angle": 0.25,
+    "stance_width": 0.20,
+    "hands_drop": 0.20,
+    "back_lean": 0.15,
+    "elbow_flare": 0.10,
+    "head_position": 0.08,
+    "stability": 0.05,
+    "posture": 0.15,
+    "reaching": 0.12,
+    "motion": 0.10,
+    "trail_leg": 0.12,
+    "balance": 0.08
+}
+
+
+def impact_score(pct_bad: float, severity_key: str, worst_deviation: float = 0) -> float:
+    """Ranking score for a pointer: share of bad frames weighted by severity, plus worst deviation."""
+    return (pct_bad / 100 * SEVERITY_WEIGHTS.get(severity_key, 0.1)) + (worst_deviation * 0.001)
+
+
+def group_events(events: List[Dict], key: str) -> Dict[str, List[Dict]]:
+    """Bucket events by one of their fields (e.g. "type" or "metric") in a single pass, keeping order."""
+    groups: Dict[str, List[Dict]] = {}
+    for e in events:
+        groups.setdefault(e[key], []).append(e)
+    return groups
+
+
+# Pointers for a metric whose share of frames past a threshold is tracked by
+# compute_aggregate_metrics. "above" marks metrics that are bad above the
+# threshold (worst = max) rather than below (worst = min). The impact score uses
+# the "severity" category and how far the "deviation_from" stat ("worst" or "avg")
+# is past the threshold (or "deviation_origin" when given). "use_timeline" rules
+# list the metric's timeline runs in "when"; the rest apply throughout the clip.
+THRESHOLD_POINTERS = (
+    {
+        "metric": "knee_angle",
+        "severity": "knee_angle",
+        "deviation_from": "worst",
+        "use_timeline": True,
+        "pct_key": "pct_above_threshold",
+        "pct_limit": 20,
+        "threshold": KNEE_ANGLE_THRESHOLD,
+        "above": True,
+        "title": "Get Lower",
+        "why": "Your average knee angle is {avg:.1f}° (threshold: {threshold}°), indicating you're standing too upright in {pct:.0f}% of frames.",
+        "fix": "Bend your knees more to lower your center of gravity. Aim for a knee angle around 120-140° for optimal wrestling stance.",
+        "evidence": "Avg knee angle {avg:.1f}°, worst {worst:.1f}°, {pct:.0f}% frames too high",
+    },
+    {
+        "metric": "stance_width",
+        "severity": "stance_width",
+        "deviation_from": "worst",
+        "use_timeline": True,
+        "pct_key": "pct_below_threshold",
+        "pct_limit": 20,
+        "threshold": STANCE_WIDTH_THRESHOLD,
+        "above": False,
+        "title": "Widen Your Base",
+        "why": "Your stance width ({avg:.3f} normalized) is narrow in {pct:.0f}% of frames, reducing stability and mobility.",
+        "fix": "Spread your feet wider, roughly shoulder-width apart or slightly more. A wider base improves balance and takedown defense.",
+        "evidence": "Avg stance width {avg:.3f}, narrowest {worst:.3f}, {pct:.0f}% too narrow",
+    },
+    {
+        "metric": "hands_drop",
+        "severity": "hands_drop",
+        "deviation_from": "worst",
+        "use_timeline": True,
+        "pct_key": "pct_above_threshold",
+        "pct_limit": 15,
+        "threshold": HANDS_DROP_THRESHOLD,
+        "above": True,
+        "title": "Keep Hands Up",
+        "why": "Your hands are dropping {avg:.3f} units below shoulder level in {pct:.0f}% of frames, leaving you vulnerable to attacks.",
+        "fix": "Keep your hands up at chest/shoulder level. Active hands help with grip fighting, shot defense, and quick attacks.",
+        "evidence": "Hands drop {avg:.3f}, worst {worst:.3f}, {pct:.0f}% dropped",
+    },
+    {
+        "metric": "torso_angle",
+        "severity": "posture",
+        "deviation_from": "avg",
+        "use_timeline": False,
+        "pct_key": "pct_too_bent",
+        "pct_limit": 20,
+        "threshold": TORSO_ANGLE_TOO_BENT,
+        "above": True,
+        "title": "Chest Up, Don't Bend at Waist",
+        "why": "Your torso angle averages {avg:.1f}° forward lean, with {pct:.0f}% of frames showing excessive waist bending instead of knee bending.",
+        "fix": "Keep your chest up and proud. Lower your level by bending your knees and hips, not by hunching your back. A straight spine maintains power.",
+        "evidence": "Avg torso angle {avg:.1f}°, worst {worst:.1f}°, {pct:.0f}% too bent",
+    },
+    {
+        "metric": "head_y_relative",
+        "severity": "head_position",
+        "deviation_from": "avg",
+        "deviation_origin": 0.0,  # Scored by how far behind the hips, not past the threshold
+        "use_timeline": False,
+        "pct_key": "pct_behind_hips",
+        "pct_limit": 15,
+        "threshold": HEAD_BEHIND_HIPS_THRESHOLD,
+        "above": False,
+        "title": "Head Position - Stay Forward",
+        "why": "Your head is dropping behind your hips in {pct:.0f}% of frames (avg relative position: {avg:.3f}), hurting your balance and reaction time.",
+        "fix": "Keep your head up and slightly forward over your hips. Your head leads your body - if it's behind, you're off balance and slow to react.",
+        "evidence": "Head y-relative {avg:.3f}, {pct:.0f}% behind hips",
+    },
+)
+
+
 def generate_rich_pointers(metrics: Dict, timeline: List[Dict], wrestling_events: List[Dict] = None) -> List[Dict]:
     """
     Generate rich coaching pointers based on aggregated metrics.
@@ -882,120 +1583,45 @@ def generate_rich_pointers(metrics: Dict, timeline: List[Dict], wrestling_events
     pointers = []
     wrestling_events = wrestling_events or []
     
-    # Severity weights for ranking
-    SEVERITY_WEIGHTS = {
-        "knee_angle": 0.25,
-        "stance_width": 0.20,
-        "hands_drop": 0.20,
-        "back_lean": 0.15,
-        "elbow_flare": 0.10,
-        "head_position": 0.08,
-        "stability": 0.05,
-        "posture": 0.15,
-        "reaching": 0.12,
-        "motion": 0.10,
-        "trail_leg": 0.12,
-        "balance": 0.08
-    }
+    # Group timeline and wrestling events once instead of filtering per pointer
+    timeline_by_metric = group_events(timeline, "metric")
+    events_by_type = group_events(wrestling_events, "type")
     
-    # Helper to calculate impact score
-    def impact_score(pct_bad: float, severity_key: str, worst_deviation: float = 0) -> float:
-        return (pct_bad / 100 * SEVERITY_WEIGHTS.get(severity_key, 0.1)) + (worst_deviation * 0.001)
-    
-    # 1. Knee angle analysis
-    knee = metrics.get("knee_angle", {})
-    if knee.get("avg") is not None:
-        pct_bad = knee.get("pct_above_threshold", 0)
-        avg_angle = knee.get("avg", 0)
-        worst = knee.get("max", avg_angle)
-        
-        if pct_bad > 20 or avg_angle > KNEE_ANGLE_THRESHOLD:
-            knee_events = [e for e in timeline if e["metric"] == "knee_angle"]
-            timestamps = [str(e["timestamp"]) + "s" for e in knee_events[:3]]
-            when = f"Occurred at: {', '.join(timestamps)}" if timestamps else "Throughout the clip"
-            
-            pointers.append({
-                "title": "Get Lower",
-                "why": f"Your average knee angle is {avg_angle:.1f}° (threshold: {KNEE_ANGLE_THRESHOLD}°), indicating you're standing too upright in {pct_bad:.0f}% of frames.",
-                "fix": "Bend your knees more to lower your center of gravity. Aim for a knee angle around 120-140° for optimal wrestling stance.",
-                "evidence": f"Avg knee angle {avg_angle:.1f}°, worst {worst:.1f}°, {pct_bad:.0f}% frames too high",
-                "when": when,
-                "score": impact_score(pct_bad, "knee_angle", worst - KNEE_ANGLE_THRESHOLD if worst > KNEE_ANGLE_THRESHOLD else 0)
-            })
-    
-    # 2. Stance width analysis
-    stance = metrics.get("stance_width", {})
-    if stance.get("avg") is not None:
-        pct_bad = stance.get("pct_below_threshold", 0)
-        avg_width = stance.get("avg", 0)
-        narrowest = stance.get("min", avg_width)
+    # 1-5. Knee angle, stance width, hand position, posture and head height (see THRESHOLD_POINTERS)
+    for rule in THRESHOLD_POINTERS:
+        stats = metrics.get(rule["metric"], {})
+        if stats.get("avg") is None:
+            continue
         
-        if pct_bad > 20 or avg_width < STANCE_WIDTH_THRESHOLD:
-            stance_events = [e for e in timeline if e["metric"] == "stance_width"]
-            timestamps = [str(e["timestamp"]) + "s" for e in stance_events[:3]]
-            when = f"Occurred at: {', '.join(timestamps)}" if timestamps else "Throughout the clip"
-            
-            pointers.append({
-                "title": "Widen Your Base",
-                "why": f"Your stance width ({avg_width:.3f} normalized) is narrow in {pct_bad:.0f}% of frames, reducing stability and mobility.",
-                "fix": "Spread your feet wider, roughly shoulder-width apart or slightly more. A wider base improves balance and takedown defense.",
-                "evidence": f"Avg stance width {avg_width:.3f}, narrowest {narrowest:.3f}, {pct_bad:.0f}% too narrow",
-                "when": when,
-                "score": impact_score(pct_bad, "stance_width", STANCE_WIDTH_THRESHOLD - narrowest if narrowest < STANCE_WIDTH_THRESHOLD else 0)
-            })
-    
-    # 3. Hand position analysis
-    hands = metrics.get("hands_drop", {})
-    if hands.get("avg") is not None:
-        pct_bad = hands.get("pct_above_threshold", 0)
-        avg_drop = hands.get("avg", 0)
-        worst_drop = hands.get("max", avg_drop)
+        threshold = rule["threshold"]
+        pct_bad = stats.get(rule["pct_key"], 0)
+        avg = stats.get("avg", 0)
+        worst = stats.get("max" if rule["above"] else "min", avg)
+        measured = worst if rule["deviation_from"] == "worst" else avg
+        origin = rule.get("deviation_origin", threshold)
+        if rule["above"]:
+            is_bad = avg > threshold
+            deviation = measured - origin if measured > origin else 0
+        else:
+            is_bad = avg < threshold
+            deviation = origin - measured if measured < origin else 0
         
-        if pct_bad > 15 or avg_drop > HANDS_DROP_THRESHOLD:
-            hands_events = [e for e in timeline if e["metric"] == "hands_drop"]
-            timestamps = [str(e["timestamp"]) + "s" for e in hands_events[:3]]
-            when = f"Occurred at: {', '.join(timestamps)}" if timestamps else "Throughout the clip"
+        if pct_bad > rule["pct_limit"] or is_bad:
+            when = "Throughout the clip"
+            if rule["use_timeline"]:
+                metric_events = timeline_by_metric.get(rule["metric"], [])
+                timestamps = [str(e["timestamp"]) + "s" for e in metric_events[:3]]
+                if timestamps:
+                    when = f"Occurred at: {', '.join(timestamps)}"
+            values = {"avg": avg, "worst": worst, "pct": pct_bad, "threshold": threshold}
             
             pointers.append({
-                "title": "Keep Hands Up",
-                "why": f"Your hands are dropping {avg_drop:.3f} units below shoulder level in {pct_bad:.0f}% of frames, leaving you vulnerable to attacks.",
-                "fix": "Keep your hands up at chest/shoulder level. Active hands help with grip fighting, shot defense, and quick attacks.",
-                "evidence": f"Hands drop {avg_drop:.3f}, worst {worst_drop:.3f}, {pct_bad:.0f}% dropped",
+                "title": rule["title"],
+                "why": rule["why"].format(**values),
+                "fix": rule["fix"],
+                "evidence": rule["evidence"].format(**values),
                 "when": when,
-                "score": impact_score(pct_bad, "hands_drop", worst_drop - HANDS_DROP_THRESHOLD if worst_drop > HANDS_DROP_THRESHOLD else 0)
-            })
-    
-    # 4. Posture / Back angle analysis (bent at waist vs chest up)
-    torso = metrics.get("torso_angle", {})
-    if torso.get("avg") is not None:
-        pct_bent = torso.get("pct_too_bent", 0)
-        avg_torso = torso.get("avg", 0)
-        worst_torso = torso.get("max", avg_torso)
-        
-        if pct_bent > 20 or avg_torso > TORSO_ANGLE_TOO_BENT:
-            pointers.append({
-                "title": "Chest Up, Don't Bend at Waist",
-                "why": f"Your torso angle averages {avg_torso:.1f}° forward lean, with {pct_bent:.0f}% of frames showing excessive waist bending instead of knee bending.",
-                "fix": "Keep your chest up and proud. Lower your level by bending your knees and hips, not by hunching your back. A straight spine maintains power.",
-                "evidence": f"Avg torso angle {avg_torso:.1f}°, worst {worst_torso:.1f}°, {pct_bent:.0f}% too bent",
-                "when": "Throughout the clip",
-                "score": impact_score(pct_bent, "posture", avg_torso - TORSO_ANGLE_TOO_BENT if avg_torso > TORSO_ANGLE_TOO_BENT else 0)
-            })
-    
-    # 5. Head position (vertical - head behind hips)
-    head_y = metrics.get("head_y_relative", {})
-    if head_y.get("avg") is not None:
-        pct_behind = head_y.get("pct_behind_hips", 0)
-        avg_head_y = head_y.get("avg", 0)
-        
-        if pct_behind > 15 or avg_head_y < HEAD_BEHIND_HIPS_THRESHOLD:
-            pointers.append({
-                "title": "Head Position - Stay Forward",
-                "why": f"Your head is dropping behind your hips in {pct_behind:.0f}% of frames (avg relative position: {avg_head_y:.3f}), hurting your balance and reaction time.",
-                "fix": "Keep your head up and slightly forward over your hips. Your head leads your body - if it's behind, you're off balance and slow to react.",
-                "evidence": f"Head y-relative {avg_head_y:.3f}, {pct_behind:.0f}% behind hips",
-                "when": "Throughout the clip",
-                "score": impact_score(pct_behind, "head_position", abs(avg_head_y) if avg_head_y < 0 else 0)
+                "score": impact_score(pct_bad, rule["severity"], deviation)
             })
     
     # 6. Reaching / Entry distance (hands extend far without foot movement)
@@ -1035,7 +1661,7 @@ def generate_rich_pointers(metrics: Dict, timeline: List[Dict], wrestling_events
     
     # 8. Trail leg recovery during shot attempts
     trail = metrics.get("trail_leg", {})
-    shot_events = [e for e in wrestling_events if e["type"] == "SHOT_ATTEMPT"]
+    shot_events = events_by_type.get("SHOT_ATTEMPT", [])
     if trail.get("avg") is not None and shot_events:
         avg_trail = trail.get("avg", 0)
         # During a shot, trail leg should be relatively straight (higher angle) for drive
@@ -1121,8 +1747,8 @@ def generate_rich_pointers(metrics: Dict, timeline: List[Dict], wrestling_events
             })
     
     # 14. Add event-based tips if wrestling events were detected
-    level_changes = [e for e in wrestling_events if e["type"] == "LEVEL_CHANGE"]
-    sprawls = [e for e in wrestling_events if e["type"] == "SPRAWL_DEFENSE"]
+    level_changes = events_by_type.get("LEVEL_CHANGE", [])
+    sprawls = events_by_type.get("SPRAWL_DEFENSE", [])
     
     if level_changes:
         lc_times = [f"{e['t_start']:.2f}s" for e in level_changes[:3]]
@@ -1209,9 +1835,10 @@ def generate_coach_speech(
     lateral_var = metrics.get("lateral_motion", {}).get("variance", 0)
     
     # Get event counts
-    level_changes = [e for e in wrestling_events if e["type"] == "LEVEL_CHANGE"]
-    shot_attempts = [e for e in wrestling_events if e["type"] == "SHOT_ATTEMPT"]
-    sprawls = [e for e in wrestling_events if e["type"] == "SPRAWL_DEFENSE"]
+    events_by_type = group_events(wrestling_events, "type")
+    level_changes = events_by_type.get("LEVEL_CHANGE", [])
+    shot_attempts = events_by_type.get("SHOT_ATTEMPT", [])
+    sprawls = events_by_type.get("SPRAWL_DEFENSE", [])
     
     # Collect top tip titles (first 5)
     top_tips = [p["title"] for p in pointers[:5]] if pointers else []
@@ -1392,6 +2019,57 @@ def map_landmarks_to_frame(
         landmark.y = abs_y / frame_height
 
 
+def interpolate_landmarks(
+    previous: Optional[Tuple[float, Optional[np.ndarray]]],
+    upcoming: Optional[Tuple[float, Optional[np.ndarray]]],
+    timestamp: float
+) -> Optional[np.ndarray]:
+    """
+    Overlay landmarks for a frame skipped by the pose stride.
+    
+    previous/upcoming are the (timestamp, landmarks or None) pose samples on
+    either side of the frame. Landmarks are linearly interpolated when both
+    samples found a pose; otherwise the previous pose is held (or None).
+    Only used for drawing - metrics come from real samples.
+    """
+    if previous is None or previous[1] is None:
+        return None
+    if upcoming is None or upcoming[1] is None:
+        return previous[1]
+    
+    (t0, start), (t1, end) = previous, upcoming
+    if t1 <= t0:
+        return start
+    alpha = (timestamp - t0) / (t1 - t0)
+    return start + (end - start) * alpha
+
+
+def landmarks_to_frame_array(
+    landmarks,
+    roi_x: int,
+    roi_y: int,
+    roi_w: int,
+    roi_h: int,
+    frame_width: int,
+    frame_height: int
+) -> np.ndarray:
+    """
+    Copy ROI-relative landmarks into an (N, 4) array in full-frame coordinates.
+    
+    Same mapping as map_landmarks_to_frame, applied to whole columns at once
+    instead of writing x/y back onto every landmark object.
+    
+    Metrics are computed on this frame-space array rather than on the raw
+    ROI-normalized landmarks: the ROI size changes every frame, so ROI-space
+    distances (stance width, hip/ankle positions used by the event detectors)
+    would not be comparable across frames with the current thresholds.
+    """
+    arr = landmarks_to_array(landmarks)
+    arr[:, 0] = (arr[:, 0] * roi_w + roi_x) / frame_width
+    arr[:, 1] = (arr[:, 1] * roi_h + roi_y) / frame_height
+    return arr
+
+
 def draw_target_box(frame: np.ndarray, box: Dict, tracking_ok: bool = True):
     """Draw the target bounding box on the frame."""
     x, y, w, h = box["x"], box["y"], box["w"], box["h"]
@@ -1404,6 +2082,57 @@ def draw_target_box(frame: np.ndarray, box: Dict, tracking_ok: bool = True):
                 0.6, color, 2)
 
 
+def has_detectable_pose(
+    cap,
+    first_frame: np.ndarray,
+    target_box: Dict,
+    start_frame: int,
+    num_frames: int,
+    samples: int = POSE_PRECHECK_SAMPLES
+) -> bool:
+    """
+    Quick check that a pose can be found somewhere in the analysis window.
+    
+    Tries the target ROI in the already-decoded first frame, then up to
+    `samples` - 1 frames spread over the window, cropped around the person
+    YOLO selects in each. Stops at the first pose, so usable clips pay for
+    one lite-model inference. Runs on the IMAGE-mode landmarker, so the
+    analysis's tracking graph is left as is. Leaves `cap` positioned right
+    after first_frame.
+    """
+    height, width = first_frame.shape[:2]
+    step = max(1, num_frames // max(1, samples))
+    candidates = [(start_frame, first_frame, target_box)]
+    candidates += [(start_frame + i * step, None, None) for i in range(1, samples) if i * step < num_frames]
+    
+    landmarker = get_image_pose_landmarker("lite")
+    seeked = False
+    try:
+        for frame_idx, frame, box in candidates:
+            if frame is None:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                seeked = True
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                box = auto_select_target(detect_persons(frame), width, height)
+                if box is None:
+                    continue
+            
+            roi_box = expand_box(box, width, height, padding_ratio=0.2)
+            roi = frame[roi_box["y"]:roi_box["y"] + roi_box["h"], roi_box["x"]:roi_box["x"] + roi_box["w"]]
+            roi_rgb = cv2.cvtColor(downscale_for_pose(roi), cv2.COLOR_BGR2RGB)
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_rgb)
+            
+            if landmarker.detect(mp_image).pose_landmarks:
+                return True
+        return False
+    finally:
+        # Pick up after first_frame
+        if seeked:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame + 1)
+
+
 def analyze_video(
     input_path: str,
     output_path: str,
@@ -1411,7 +2140,10 @@ def analyze_video(
     t_start: float = 0.0,
     continuation: bool = False,
     clip_index: Optional[int] = None,
-    prior_context: Optional[Dict] = None
+    prior_context: Optional[Dict] = None,
+    pose_stride: Optional[int] = None,
+    pose_model: str = POSE_MODEL_VARIANT,
+    emit_video: bool = True
 ) -> dict:
     """
     Main analysis function with target tracking.
@@ -1424,15 +2156,21 @@ def analyze_video(
         continuation: Whether this is a continuation of a previous analysis
         clip_index: Index of this clip in the session (1-based)
         prior_context: Context from previous analysis for continuation mode
-        
+        pose_stride: Run pose inference on every Nth frame (1 = every frame);
+            None derives it from the clip fps and POSE_SAMPLE_HZ
+        pose_model: Pose model variant - "lite", "full", or "auto" (by target size,
+            falling back to lite if the full model is too slow)
+        emit_video: Write the annotated video to output_path; when False no
+            overlay is drawn or encoded and output_path is ignored
+    
     Returns:
         Dict with pointers, metrics, timeline, and analysis stats
-        
+    
     Raises:
         ValueError: If video cannot be opened or has no frames
     """
     # Open video
-    cap = cv2.VideoCapture(input_path)
+    cap = open_video(input_path)
     
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {input_path}")
@@ -1456,14 +2194,6 @@ def analyze_video(
     max_end_time = min(t_start + MAX_SECONDS, duration)
     max_frames_to_process = int((max_end_time - t_start) * fps)
     
-    # Setup video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
-    if not out.isOpened():
-        cap.release()
-        raise ValueError("Could not create output video writer")
-    
     # Seek to start frame
     cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
     
@@ -1471,7 +2201,6 @@ def analyze_video(
     ret, first_frame = cap.read()
     if not ret:
         cap.release()
-        out.release()
         raise ValueError(f"Could not read frame at t={t_start}s")
     
     # Initialize target tracker
@@ -1482,7 +2211,6 @@ def analyze_video(
         
         if target_box is None:
             cap.release()
-            out.release()
             raise ValueError("No person detected in video at the specified start time. Ensure a person is visible.")
     
     # Validate target box
@@ -1491,42 +2219,125 @@ def analyze_video(
     target_box["w"] = max(10, min(target_box["w"], width - target_box["x"]))
     target_box["h"] = max(10, min(target_box["h"], height - target_box["y"]))
     
+    # Fail fast on clips where no pose can be found, before decoding/encoding them
+    if not has_detectable_pose(cap, first_frame, target_box, start_frame, max_frames_to_process):
+        cap.release()
+        raise ValueError("No pose landmarks detected in video. Ensure a person is visible.")
+    
     tracker = TargetTracker(target_box, first_frame)
     
-    # Aggregation for metrics
-    frame_metrics_list: List[FrameMetrics] = []
+    # Reuse this thread's PoseLandmarker (Tasks API) across clips
+    pose_landmarker = pose_landmarker_for_target(target_box, pose_model)
+    pose_runner = ROIPoseRunner(pose_landmarker, width, height)
     
-    # Reset to start position for processing
-    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    # Setup video writer (hardware H.264 when available)
+    out = open_video_writer(output_path, fps, width, height) if emit_video else NullVideoWriter()
     
-    # Create PoseLandmarker using Tasks API
-    pose_landmarker = create_pose_landmarker(
-        running_mode=mp_vision.RunningMode.VIDEO,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
+    if not out.isOpened():
+        cap.release()
+        raise ValueError("Could not create output video writer")
+    
+    # Sampled poses (frame landmark arrays) and their timestamps; metrics are
+    # computed for all of them after the loop (analyze_landmark_series)
+    pose_series: List[np.ndarray] = []
+    pose_times: List[float] = []
+    
+    # Pose inference stride and the rate at which metrics are sampled
+    if pose_stride is None:
+        pose_stride = pose_stride_for_fps(fps)
+    pose_stride = max(1, int(pose_stride))
+    analysis_fps = fps / pose_stride
+    # (timestamp, frame landmarks or None) of the latest pose sample
+    last_pose: Optional[Tuple[float, Optional[np.ndarray]]] = None
+    
+    def track(frame_idx: int, frame: np.ndarray):
+        # Runs on the reader thread, so tracking overlaps with pose inference
+        if frame_idx == 0:
+            return True, tracker.get_current_box()
+        return tracker.update(frame)
+    
+    inv_fps = 1.0 / fps
+    
+    batch_size = pose_runner.batch_size
+    # Full frames held for drawing are capped by memory, so a batch may be cut
+    # short; without an output video only the ROI copies are kept
+    max_pending_frames = max(1, POSE_PENDING_MAX_BYTES // (width * height * 3))
+    
+    # Frames waiting for pose results: [frame, timestamp, timestamp_ms, roi_box or None, roi_rgb]
+    pending: List[list] = []
+    pending_pose = 0
+    
+    def flush_pending():
+        nonlocal last_pose, pending_pose
+        pose_entries = [entry for entry in pending if entry[3] is not None]
+        
+        if batch_size > 1:
+            # One batched call; ROIs were copied out of the shared RGB buffer
+            batch_poses = pose_runner.detect_batch(
+                [entry[4] for entry in pose_entries], [entry[3] for entry in pose_entries]
+            )
+        else:
+            batch_poses = [
+                pose_runner.detect(frame, roi_box, timestamp_ms)
+                for frame, _, timestamp_ms, roi_box, _ in pose_entries
+            ]
+        
+        # Keep each pose (full frame coordinates, as one array) for metrics
+        poses = []
+        for (_, timestamp, _, _, _), pose_landmarks in zip(pose_entries, batch_poses):
+            if pose_landmarks is not None:
+                pose_series.append(pose_landmarks)
+                pose_times.append(timestamp)
+            poses.append((timestamp, pose_landmarks))
+        
+        if not emit_video:
+            pending.clear()
+            pending_pose = 0
+            return
+        
+        poses_iter = iter(poses)
+        upcoming_pose = next(poses_iter, None)
+        for frame, timestamp, _, roi_box, _ in pending:
+            if roi_box is None:
+                # Skipped by the pose stride - interpolate the overlay between samples
+                draw_pose_landmarks(frame, interpolate_landmarks(last_pose, upcoming_pose, timestamp))
+                out.write(frame)
+                continue
+            
+            last_pose, upcoming_pose = upcoming_pose, next(poses_iter, None)
+            
+            # Draw pose landmarks on full frame
+            draw_pose_landmarks(frame, last_pose[1])
+            
+            # Write annotated frame
+            out.write(frame)
+        
+        pending.clear()
+        pending_pose = 0
     
+    completed = False
     try:
         frame_count = 0
-        while cap.isOpened() and frame_count < max_frames_to_process:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
+        # Continue from the frame already read for target selection (no re-seek)
+        frames = prefetch_frames(cap, max_frames_to_process, track, first_frame=first_frame)
+        for _, frame, (tracking_ok, current_box) in frames:
             # Calculate timestamp relative to video start (not t_start)
-            timestamp = t_start + (frame_count / fps)
+            # (from the enqueue index, so it stays aligned when batching)
+            timestamp = t_start + frame_count * inv_fps
             timestamp_ms = int(timestamp * 1000)
             frame_count += 1
             
-            # Update tracker
-            if frame_count == 1:
-                tracking_ok = True
-                current_box = tracker.get_current_box()
-            else:
-                tracking_ok, current_box = tracker.update(frame)
-            
             # Draw target box on frame
-            draw_target_box(frame, current_box, tracking_ok)
+            if emit_video:
+                draw_target_box(frame, current_box, tracking_ok)
+            
+            # Skip pose inference between strides (overlay is redrawn on flush)
+            if (frame_count - 1) % pose_stride != 0:
+                if emit_video:
+                    pending.append([frame, timestamp, timestamp_ms, None, None])
+                    if len(pending) >= max_pending_frames:
+                        flush_pending()
+                continue
             
             # Expand box for cropping (20% padding)
             expanded_box = expand_box(current_box, width, height, padding_ratio=0.2)
@@ -1534,48 +2345,32 @@ def analyze_video(
             # Crop ROI
             roi_x, roi_y = expanded_box["x"], expanded_box["y"]
             roi_w, roi_h = expanded_box["w"], expanded_box["h"]
-            roi = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+            # (expand_box keeps the crop inside the frame and non-empty)
+            roi_box = (roi_x, roi_y, roi_w, roi_h)
             
-            if roi.size == 0:
-                # Invalid crop, skip pose analysis
-                out.write(frame)
-                continue
-            
-            # Convert ROI to RGB for MediaPipe Tasks API
-            roi_rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_rgb)
-            
-            # Run pose detection using Tasks API
-            results = pose_landmarker.detect_for_video(mp_image, timestamp_ms)
+            roi_rgb = None
+            if batch_size > 1:
+                # Convert now; the copy frees the shared buffer for the next ROI
+                roi_rgb = pose_runner.batch_input(frame, roi_box)
+                if not emit_video:
+                    frame = None  # Only the ROI copy is needed
             
-            # Process landmarks if detected (Tasks API returns list of poses)
-            if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                # Get first detected pose landmarks
-                pose_landmarks = results.pose_landmarks[0]
-                
-                # Map landmarks back to full frame coordinates
-                map_landmarks_to_frame(
-                    pose_landmarks,
-                    roi_x, roi_y, roi_w, roi_h,
-                    width, height
-                )
-                
-                # Draw pose landmarks on full frame
-                draw_pose_landmarks(frame, pose_landmarks)
-                
-                # Analyze this frame (pass the list format)
-                frame_metrics = analyze_frame_landmarks(pose_landmarks, timestamp)
-                frame_metrics_list.append(frame_metrics)
-            
-            # Write annotated frame
-            out.write(frame)
+            pending.append([frame, timestamp, timestamp_ms, roi_box, roi_rgb])
+            pending_pose += 1
+            if pending_pose >= batch_size or len(pending) >= max_pending_frames:
+                flush_pending()
+        
+        # Pose frames still queued at the end of the clip
+        flush_pending()
+        completed = True
     finally:
-        # Close the pose landmarker
-        pose_landmarker.close()
+        # Keep the landmarker for the next clip
+        pose_landmarker.finish_clip()
+        # Writer first (stops its encoder thread); on failure keep the original error
+        release_all(out, cap, raise_errors=completed)
     
-    # Cleanup
-    cap.release()
-    out.release()
+    # Per-frame metrics for every sampled pose
+    frame_metrics_list = analyze_landmark_series(pose_series, pose_times)
     
     # Check if we got any analyzed frames
     if not frame_metrics_list:
@@ -1585,10 +2380,11 @@ def analyze_video(
     aggregate_metrics = compute_aggregate_metrics(frame_metrics_list)
     
     # Detect timeline events (threshold-based)
-    timeline = detect_timeline_events(frame_metrics_list, fps)
+    # (metrics are sampled every pose_stride frames, so use the analysis rate)
+    timeline = detect_timeline_events(frame_metrics_list, analysis_fps)
     
     # Detect wrestling-specific events (level changes, shots, sprawls)
-    wrestling_events = detect_wrestling_events(frame_metrics_list, fps)
+    wrestling_events = detect_wrestling_events(frame_metrics_list, analysis_fps, pose_stride)
     
     # Generate rich pointers with wrestling events
     pointers = generate_rich_pointers(aggregate_metrics, timeline, wrestling_events)
@@ -1610,10 +2406,11 @@ def analyze_video(
     # Build match context output for continuation tracking
     match_context_out = None
     if continuation or clip_index:
-        # Calculate accumulated totals
-        total_shots = len([e for e in wrestling_events if e["type"] == "SHOT_ATTEMPT"])
-        total_level_changes = len([e for e in wrestling_events if e["type"] == "LEVEL_CHANGE"])
-        total_sprawls = len([e for e in wrestling_events if e["type"] == "SPRAWL_DEFENSE"])
+        # Calculate accumulated totals (one pass over the events)
+        events_by_type = group_events(wrestling_events, "type")
+        total_shots = len(events_by_type.get("SHOT_ATTEMPT", []))
+        total_level_changes = len(events_by_type.get("LEVEL_CHANGE", []))
+        total_sprawls = len(events_by_type.get("SPRAWL_DEFENSE", []))
         
         # Add to prior totals if available
         if prior_context:
@@ -1665,16 +2462,19 @@ def extract_first_frame(video_path: str) -> Tuple[np.ndarray, int, int]:
     
     Returns:
         Tuple of (frame_bgr, width, height)
-        
+    
     Raises:
         ValueError if video cannot be opened
     """
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video(video_path)
     
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {video_path}")
     
-    ret, frame = cap.read()
+    # grab() decodes only; the frame is converted once by retrieve()
+    ret = cap.grab()
+    if ret:
+        ret, frame = cap.retrieve()
     cap.release()
     
     if not ret:
@@ -1690,7 +2490,10 @@ def analyze_video_with_anchors(
     anchors: List[Dict],
     skill_level: str = "intermediate",
     trim_start: float = 0.0,
-    trim_end: float = None
+    trim_end: float = None,
+    pose_stride: Optional[int] = None,
+    pose_model: str = POSE_MODEL_VARIANT,
+    emit_video: bool = True
 ) -> dict:
     """
     Main analysis function with anchor-based tracking.
@@ -1702,15 +2505,21 @@ def analyze_video_with_anchors(
         input_path: Path to input video file
         output_path: Path to write annotated output video
         anchors: List of anchor dicts: [{t: float, box: {x,y,w,h}|None, skipped: bool}]
-        
+        pose_stride: Run pose inference on every Nth frame (1 = every frame);
+            None derives it from the clip fps and POSE_SAMPLE_HZ
+        pose_model: Pose model variant - "lite", "full", or "auto" (by target size,
+            falling back to lite if the full model is too slow)
+        emit_video: Write the annotated video to output_path; when False no
+            overlay is drawn or encoded and output_path is ignored
+    
     Returns:
         Dict with pointers, metrics, timeline, events, tracking_diagnostics
-        
+    
     Raises:
         ValueError: If video cannot be opened or has no frames
     """
     # Open video
-    cap = cv2.VideoCapture(input_path)
+    cap = open_video(input_path)
     
     if not cap.isOpened():
         raise ValueError(f"Could not open video file: {input_path}")
@@ -1726,22 +2535,23 @@ def analyze_video_with_anchors(
         cap.release()
         raise ValueError("Invalid video dimensions")
     
-    # Setup video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
-    if not out.isOpened():
-        cap.release()
-        raise ValueError("Could not create output video writer")
-    
     # Tracking diagnostics
     num_reacquires = 0
     num_segments_skipped = 0
     frames_with_target = 0
     total_frames_processed = 0
     
-    # Aggregation for metrics
-    frame_metrics_list: List[FrameMetrics] = []
+    # Sampled poses (frame landmark arrays) and their timestamps; metrics are
+    # computed for all of them after the loop (analyze_landmark_series)
+    pose_series: List[np.ndarray] = []
+    pose_times: List[float] = []
+    
+    # Pose inference stride and the rate at which metrics are sampled
+    if pose_stride is None:
+        pose_stride = pose_stride_for_fps(fps)
+    pose_stride = max(1, int(pose_stride))
+    analysis_fps = fps / pose_stride
+    last_landmarks = None
     
     # Filter anchors to only those with valid box or need processing
     valid_anchors = [a for a in anchors if not a.get("skipped") or a.get("box")]
@@ -1771,7 +2581,6 @@ def analyze_video_with_anchors(
         
         if start_anchor is None:
             cap.release()
-            out.release()
             raise ValueError("No valid anchor with a target box found. Please select yourself in at least one frame.")
     
     # Determine time bounds for analysis
@@ -1784,13 +2593,20 @@ def analyze_video_with_anchors(
     if last_anchor_t > max_end_time:
         max_end_time = min(last_anchor_t, duration)
     
-    # Create PoseLandmarker using Tasks API
-    pose_landmarker = create_pose_landmarker(
-        running_mode=mp_vision.RunningMode.VIDEO,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-    )
+    # Reuse this thread's PoseLandmarker (Tasks API) across clips
+    pose_landmarker = pose_landmarker_for_target(start_anchor["box"], pose_model)
+    pose_runner = ROIPoseRunner(pose_landmarker, width, height)
+    inv_fps = 1.0 / fps
+    tracker = None
+    
+    # Setup video writer (hardware H.264 when available)
+    out = open_video_writer(output_path, fps, width, height) if emit_video else NullVideoWriter()
     
+    if not out.isOpened():
+        cap.release()
+        raise ValueError("Could not create output video writer")
+    
+    completed = False
     try:
         for seg_idx in range(len(anchors) - 1):
             anchor_start = anchors[seg_idx]
@@ -1845,13 +2661,9 @@ def analyze_video_with_anchors(
                 # Write frames without analysis for skipped segment
                 start_frame = int(t_start * fps)
                 end_frame = int(t_end * fps)
-                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+                seek_frame(cap, start_frame)
                 
-                for frame_idx in range(start_frame, end_frame):
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
+                for _, frame, _ in prefetch_frames(cap, end_frame - start_frame):
                     # Draw "NO TARGET" indicator
                     cv2.putText(frame, "NO TARGET - SKIPPED", (10, 30), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 165, 255), 2)
@@ -1870,7 +2682,7 @@ def analyze_video_with_anchors(
             start_frame = int(t_start * fps)
             end_frame = int(t_end * fps)
             
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+            seek_frame(cap, start_frame)
             ret, init_frame = cap.read()
             
             if not ret:
@@ -1880,17 +2692,12 @@ def analyze_video_with_anchors(
             tracker = TargetTracker(start_box, init_frame)
             current_box = start_box.copy()
             
-            # Reset to segment start
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-            
-            # Process frames in this segment
-            frame_idx = start_frame
-            while frame_idx < end_frame:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                timestamp = frame_idx / fps
+            # Process frames in this segment, starting from init_frame (no re-seek);
+            # decoding runs ahead on a reader thread
+            last_landmarks = None
+            for offset, frame, _ in prefetch_frames(cap, end_frame - start_frame, first_frame=init_frame):
+                frame_idx = start_frame + offset
+                timestamp = frame_idx * inv_fps
                 
                 # Update tracker
                 if frame_idx == start_frame:
@@ -1929,55 +2736,45 @@ def analyze_video_with_anchors(
                             tracking_ok = True
                 
                 # Draw target box
-                draw_target_box(frame, current_box, tracking_ok)
+                if emit_video:
+                    draw_target_box(frame, current_box, tracking_ok)
                 
                 if tracking_ok:
                     frames_with_target += 1
                 
+                # Only run pose inference on every pose_stride-th frame
+                run_pose = (frame_idx - start_frame) % pose_stride == 0
+                
                 # Expand box for cropping
                 expanded_box = expand_box(current_box, width, height, padding_ratio=0.2)
                 
                 # Crop ROI
-                roi_x, roi_y = expanded_box["x"], expanded_box["y"]
-                roi_w, roi_h = expanded_box["w"], expanded_box["h"]
-                roi = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+                roi_box = (expanded_box["x"], expanded_box["y"], expanded_box["w"], expanded_box["h"])
                 
-                if roi.size > 0:
-                    # Convert ROI to RGB for MediaPipe Tasks API
-                    roi_rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-                    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_rgb)
-                    
+                if not run_pose:
+                    # Skipped frame - redraw the last overlay
+                    if emit_video and last_landmarks is not None:
+                        draw_pose_landmarks(frame, last_landmarks)
+                else:
                     # Use timestamp in milliseconds for video mode
-                    timestamp_ms = int(timestamp * 1000)
-                    results = pose_landmarker.detect_for_video(mp_image, timestamp_ms)
+                    last_landmarks = pose_runner.detect(frame, roi_box, int(timestamp * 1000))
                     
-                    # Process landmarks if detected (Tasks API returns list of poses)
-                    if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                        # Get first detected pose landmarks
-                        pose_landmarks = results.pose_landmarks[0]
-                        
-                        # Map landmarks back to full frame coordinates
-                        map_landmarks_to_frame(
-                            pose_landmarks,
-                            roi_x, roi_y, roi_w, roi_h,
-                            width, height
-                        )
-                        
+                    if last_landmarks is not None:
                         # Draw pose landmarks on full frame
-                        draw_pose_landmarks(frame, pose_landmarks)
+                        if emit_video:
+                            draw_pose_landmarks(frame, last_landmarks)
                         
-                        # Analyze this frame
-                        frame_metrics = analyze_frame_landmarks(pose_landmarks, timestamp)
-                        frame_metrics_list.append(frame_metrics)
+                        # Keep the pose for metrics
+                        pose_series.append(last_landmarks)
+                        pose_times.append(timestamp)
                 
                 # Write annotated frame
                 out.write(frame)
                 total_frames_processed += 1
-                frame_idx += 1
             
             # At segment end, if next anchor has a box, prepare for hard reset
             # (This will happen automatically in the next iteration's start_box selection)
-    
+        
         # Process any remaining frames after the last anchor (up to max_end_time)
         last_anchor_t = anchors[-1].get("t", duration) if anchors else duration
         if last_anchor_t < max_end_time:
@@ -1986,67 +2783,62 @@ def analyze_video_with_anchors(
             remaining_end = int(max_end_time * fps)
             
             if remaining_start < remaining_end:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, remaining_start)
+                seek_frame(cap, remaining_start)
+                last_landmarks = None
                 
-                for frame_idx in range(remaining_start, remaining_end):
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    timestamp = frame_idx / fps
+                for offset, frame, _ in prefetch_frames(cap, remaining_end - remaining_start):
+                    frame_idx = remaining_start + offset
+                    timestamp = frame_idx * inv_fps
                     timestamp_ms = int(timestamp * 1000)
                     
                     # Try to continue tracking if we have a valid tracker
-                    if 'tracker' in dir() and tracker is not None:
+                    if tracker is not None:
                         tracking_ok, current_box = tracker.update(frame)
-                        draw_target_box(frame, current_box, tracking_ok)
+                        if emit_video:
+                            draw_target_box(frame, current_box, tracking_ok)
                         
                         if tracking_ok:
                             frames_with_target += 1
                         
-                        # Pose analysis
+                        # Pose analysis (every pose_stride-th frame)
+                        run_pose = (frame_idx - remaining_start) % pose_stride == 0
                         expanded_box = expand_box(current_box, width, height, padding_ratio=0.2)
-                        roi_x, roi_y = expanded_box["x"], expanded_box["y"]
-                        roi_w, roi_h = expanded_box["w"], expanded_box["h"]
-                        roi = frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w]
+                        roi_box = (expanded_box["x"], expanded_box["y"], expanded_box["w"], expanded_box["h"])
                         
-                        if roi.size > 0:
-                            roi_rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-                            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=roi_rgb)
-                            results = pose_landmarker.detect_for_video(mp_image, timestamp_ms)
+                        if not run_pose:
+                            if emit_video and last_landmarks is not None:
+                                draw_pose_landmarks(frame, last_landmarks)
+                        else:
+                            last_landmarks = pose_runner.detect(frame, roi_box, timestamp_ms)
                             
-                            if results.pose_landmarks and len(results.pose_landmarks) > 0:
-                                pose_landmarks = results.pose_landmarks[0]
-                                
-                                map_landmarks_to_frame(
-                                    pose_landmarks,
-                                    roi_x, roi_y, roi_w, roi_h,
-                                    width, height
-                                )
-                                
+                            if last_landmarks is not None:
                                 # Draw pose landmarks on full frame
-                                draw_pose_landmarks(frame, pose_landmarks)
+                                if emit_video:
+                                    draw_pose_landmarks(frame, last_landmarks)
                                 
-                                frame_metrics = analyze_frame_landmarks(pose_landmarks, timestamp)
-                                frame_metrics_list.append(frame_metrics)
+                                pose_series.append(last_landmarks)
+                                pose_times.append(timestamp)
                     
                     out.write(frame)
                     total_frames_processed += 1
+        completed = True
     finally:
-        # Close the pose landmarker
-        pose_landmarker.close()
+        # Keep the landmarker for the next clip
+        pose_landmarker.finish_clip()
+        # Writer first (stops its encoder thread); on failure keep the original error
+        release_all(out, cap, raise_errors=completed)
     
-    # Cleanup
-    cap.release()
-    out.release()
+    # Per-frame metrics for every sampled pose
+    frame_metrics_list = analyze_landmark_series(pose_series, pose_times)
     
     # Check if we got any analyzed frames
     if not frame_metrics_list:
         raise ValueError("No pose landmarks detected in video. Ensure a person is visible.")
     
     # Detect inactive frames (standing/not wrestling)
+    # (metrics are sampled every pose_stride frames, so detectors use the analysis rate)
     inactive_indices, percent_inactive, percent_active = detect_inactive_frames(
-        frame_metrics_list, fps
+        frame_metrics_list, analysis_fps
     )
     
     # Filter out inactive frames for metric computation
@@ -2071,10 +2863,10 @@ def analyze_video_with_anchors(
     }
     
     # Detect timeline events on ACTIVE frames only
-    timeline = detect_timeline_events(active_frame_metrics, fps)
+    timeline = detect_timeline_events(active_frame_metrics, analysis_fps)
     
     # Detect wrestling-specific events on ACTIVE frames only
-    wrestling_events = detect_wrestling_events(active_frame_metrics, fps)
+    wrestling_events = detect_wrestling_events(active_frame_metrics, analysis_fps, pose_stride)
     
     # Generate rich pointers based on active frames
     pointers = generate_rich_pointers(aggregate_metrics, timeline, wrestling_events)
@@ -0,0 +1,92 @@
+"""
+ONNX Runtime Pose Backend for Wrestling Coach
+Runs the BlazePose landmark network through ONNX Runtime, batching ROIs
+from several frames into one inference call.
+
+MediaPipe's VIDEO-mode landmarker takes one frame per call, so batching
+needs the landmark model run directly. Enable with WRESTLEAI_POSE_BACKEND=onnx;
+the CUDA execution provider is used when onnxruntime-gpu is installed,
+otherwise ONNX Runtime runs on the CPU. MediaPipe remains the default and
+the fallback.
+
+Uses the same models/pose_landmark_<variant>.onnx as the TensorRT backend
+(see blazepose.py).
+"""
+
+from typing import List
+import numpy as np
+
+from .blazepose import PoseLandmarkResult, decode_landmarks, fill_input, onnx_model_path
+
+# Largest batch for ONNX graphs exported with a dynamic batch dimension
+POSE_ONNX_MAX_BATCH = 16
+
+POSE_ONNX_PROVIDERS = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+
+
+class ONNXPoseLandmarker:
+    """
+    BlazePose landmark network on ONNX Runtime with a PoseLandmarker-like interface.
+    
+    Like TRTPoseLandmarker, detect_batch() takes RGB ROIs and returns results
+    whose pose_landmarks[0] is a (33, 4) array of ROI-normalized x, y, z and
+    visibility; detect_for_video() takes the mp.Image used by the MediaPipe path.
+    """
+    
+    def __init__(self, model_variant: str = "lite"):
+        import onnxruntime as ort
+        
+        onnx_path = onnx_model_path(model_variant)
+        if not onnx_path.exists():
+            raise RuntimeError(f"Pose landmark ONNX model not found at: {onnx_path}")
+        
+        available = set(ort.get_available_providers())
+        providers = [p for p in POSE_ONNX_PROVIDERS if p in available]
+        self._session = ort.InferenceSession(str(onnx_path), providers=providers)
+        
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        self._output_names = [output.name for output in self._session.get_outputs()]
+        
+        # Symbolic or missing leading dimension means the graph accepts any batch
+        shape = model_input.shape
+        dynamic_batch = not isinstance(shape[0], int)
+        self.max_batch = POSE_ONNX_MAX_BATCH if dynamic_batch else shape[0]
+        self._nchw = shape[1] == 3
+        self._input_size = shape[3] if self._nchw else shape[2]
+        
+        sample_shape = (3, self._input_size, self._input_size) if self._nchw else (self._input_size, self._input_size, 3)
+        self._input = np.empty((self.max_batch,) + sample_shape, dtype=np.float32)
+    
+    def detect_batch(self, rgb_images: List[np.ndarray]) -> List[PoseLandmarkResult]:
+        """
+        Run the landmark network on several RGB ROIs.
+        
+        Images are submitted max_batch at a time (1 for graphs with a fixed
+        batch of one), amortizing per-call overhead and host/device transfers.
+        """
+        results = []
+        for start in range(0, len(rgb_images), self.max_batch):
+            chunk = rgb_images[start:start + self.max_batch]
+            placements = [
+                fill_input(self._input[slot], rgb, self._input_size, self._nchw)
+                for slot, rgb in enumerate(chunk)
+            ]
+            outputs = self._session.run(self._output_names, {self._input_name: self._input[:len(chunk)]})
+            results.extend(
+                decode_landmarks([output[slot] for output in outputs], placement, self._input_size)
+                for slot, placement in enumerate(placements)
+            )
+        return results
+    
+    def detect(self, image) -> PoseLandmarkResult:
+        return self.detect_batch([image.numpy_view()])[0]
+    
+    def detect_for_video(self, image, timestamp_ms: int) -> PoseLandmarkResult:
+        return self.detect(image)
+    
+    def finish_clip(self):
+        """No temporal state is kept between frames, so nothing to reset."""
+    
+    def close(self):
+        self._session = None
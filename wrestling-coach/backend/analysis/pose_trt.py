@@ -0,0 +1,269 @@
+"""
+TensorRT Pose Backend for Wrestling Coach
+Runs the BlazePose landmark network as a TensorRT engine on NVIDIA GPUs.
+
+The analysis loop already crops the tracked wrestler (YOLO + CSRT), so only
+the landmark stage of BlazePose is needed - the ROI takes the place of the
+pose detector's output. Enable with WRESTLEAI_POSE_BACKEND=trt; MediaPipe
+remains the default and the fallback.
+
+Requires tensorrt and pycuda, plus the landmark model exported to ONNX
+(see blazepose.py).
+
+Engines are built in FP16 by default. WRESTLEAI_POSE_TRT_PRECISION=int8
+builds an INT8 engine instead, calibrated on RGB ROI crops saved as .npy
+files in models/pose_calibration/ (a few hundred representative frames).
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import List, Tuple
+import numpy as np
+
+from .blazepose import PoseLandmarkResult, decode_landmarks, fill_input, onnx_model_path
+from .model_utils import MODELS_DIR
+
+# Largest batch for ONNX graphs exported with a dynamic batch dimension
+POSE_TRT_MAX_BATCH = 16
+
+# Engine precision: "fp16" or "int8" (needs calibration data, else falls back to fp16)
+POSE_TRT_PRECISION = os.environ.get("WRESTLEAI_POSE_TRT_PRECISION", "fp16").lower()
+
+# RGB uint8 ROI crops (.npy) used to calibrate INT8 engines, and how many to use
+POSE_CALIBRATION_DIR = MODELS_DIR / "pose_calibration"
+POSE_CALIBRATION_MAX_FRAMES = 500
+
+
+def _plan_path(model_variant: str, device_name: str, precision: str = "fp16") -> Path:
+    """Engine plans are GPU-specific, so the device name is part of the file name."""
+    gpu = re.sub(r"[^a-z0-9]+", "_", device_name.lower()).strip("_")
+    return MODELS_DIR / f"pose_landmark_{model_variant}_{gpu}_{precision}.plan"
+
+
+def _calibration_cache_path(model_variant: str) -> Path:
+    return MODELS_DIR / f"pose_landmark_{model_variant}_int8.calib"
+
+
+def _calibration_files() -> List[Path]:
+    if not POSE_CALIBRATION_DIR.is_dir():
+        return []
+    return sorted(POSE_CALIBRATION_DIR.glob("*.npy"))[:POSE_CALIBRATION_MAX_FRAMES]
+
+
+def _make_int8_calibrator(trt, files: List[Path], sample_shape: Tuple[int, ...], cache_path: Path):
+    """
+    Build an entropy calibrator feeding letterboxed ROIs one at a time.
+    
+    The class is created here because tensorrt is only imported on use.
+    The calibration cache is written next to the models so later builds
+    (e.g. on another GPU) skip the calibration pass.
+    """
+    import pycuda.driver as cuda
+    
+    nchw = sample_shape[0] == 3
+    size = sample_shape[2] if nchw else sample_shape[1]
+    
+    class PoseInt8Calibrator(trt.IInt8EntropyCalibrator2):
+        def __init__(self):
+            trt.IInt8EntropyCalibrator2.__init__(self)
+            self._files = iter(files)
+            self._host = np.empty((1,) + tuple(sample_shape), dtype=np.float32)
+            self._device = cuda.mem_alloc(self._host.nbytes)
+        
+        def get_batch_size(self):
+            return 1
+        
+        def get_batch(self, names):
+            path = next(self._files, None)
+            if path is None:
+                return None
+            fill_input(self._host[0], np.load(path), size, nchw)
+            cuda.memcpy_htod(self._device, self._host)
+            return [int(self._device)]
+        
+        def read_calibration_cache(self):
+            return cache_path.read_bytes() if cache_path.exists() else None
+        
+        def write_calibration_cache(self, cache):
+            cache_path.write_bytes(bytes(cache))
+    
+    return PoseInt8Calibrator()
+
+
+def build_engine(onnx_path: Path, plan_path: Path, precision: str = "fp16", model_variant: str = "lite"):
+    """
+    Build a TensorRT engine from an ONNX graph and save the plan.
+    
+    FP16 is used where the GPU supports it. With precision="int8" the
+    engine is additionally calibrated on POSE_CALIBRATION_DIR; layers
+    without INT8 kernels stay in FP16.
+    
+    Returns:
+        Serialized engine bytes
+    
+    Raises:
+        RuntimeError: If the ONNX graph can't be parsed or the build fails
+    """
+    import tensorrt as trt
+    
+    logger = trt.Logger(trt.Logger.WARNING)
+    builder = trt.Builder(logger)
+    flags = 0
+    if hasattr(trt.NetworkDefinitionCreationFlag, "EXPLICIT_BATCH"):
+        flags = 1 << int(trt.NetworkDefinitionCreationFlag.EXPLICIT_BATCH)
+    network = builder.create_network(flags)
+    parser = trt.OnnxParser(network, logger)
+    
+    if not parser.parse(onnx_path.read_bytes()):
+        errors = "; ".join(str(parser.get_error(i)) for i in range(parser.num_errors))
+        raise RuntimeError(f"Could not parse {onnx_path}: {errors}")
+    
+    config = builder.create_builder_config()
+    if builder.platform_has_fast_fp16:
+        config.set_flag(trt.BuilderFlag.FP16)
+    
+    # Dynamic batch dimension: let the engine accept 1..POSE_TRT_MAX_BATCH ROIs per call
+    input_tensor = network.get_input(0)
+    sample_shape = tuple(input_tensor.shape)[1:]
+    dynamic_batch = input_tensor.shape[0] == -1
+    if dynamic_batch:
+        profile = builder.create_optimization_profile()
+        profile.set_shape(
+            input_tensor.name,
+            (1,) + sample_shape,
+            (POSE_TRT_MAX_BATCH,) + sample_shape,
+            (POSE_TRT_MAX_BATCH,) + sample_shape
+        )
+        config.add_optimization_profile(profile)
+    
+    if precision == "int8":
+        config.set_flag(trt.BuilderFlag.INT8)
+        config.int8_calibrator = _make_int8_calibrator(
+            trt, _calibration_files(), sample_shape, _calibration_cache_path(model_variant)
+        )
+        if dynamic_batch:
+            # The calibrator feeds one ROI at a time
+            calibration_profile = builder.create_optimization_profile()
+            calibration_profile.set_shape(input_tensor.name, *[(1,) + sample_shape] * 3)
+            config.set_calibration_profile(calibration_profile)
+    
+    serialized = builder.build_serialized_network(network, config)
+    if serialized is None:
+        raise RuntimeError(f"TensorRT engine build failed for {onnx_path}")
+    
+    plan_path.write_bytes(bytes(serialized))
+    return bytes(serialized)
+
+
+class TRTPoseLandmarker:
+    """
+    BlazePose landmark network on TensorRT with a PoseLandmarker-like interface.
+    
+    detect_for_video() takes the same mp.Image of the ROI as the MediaPipe
+    path and returns a result whose pose_landmarks[0] is a (33, 4) array of
+    ROI-normalized x, y, z and visibility, which the analysis code accepts
+    wherever it accepts MediaPipe landmarks.
+    """
+    
+    def __init__(self, model_variant: str = "lite", precision: str = POSE_TRT_PRECISION):
+        import tensorrt as trt
+        import pycuda.autoinit  # noqa: F401 - creates the CUDA context
+        import pycuda.driver as cuda
+        
+        self._cuda = cuda
+        
+        if precision == "int8":
+            has_int8 = trt.Builder(trt.Logger(trt.Logger.WARNING)).platform_has_fast_int8
+            cache_exists = _calibration_cache_path(model_variant).exists()
+            if not has_int8 or not (cache_exists or _calibration_files()):
+                print("INT8 pose engine unavailable (no INT8 tensor cores or calibration data), using FP16")
+                precision = "fp16"
+        self.precision = precision
+        
+        onnx_path = onnx_model_path(model_variant)
+        plan_path = _plan_path(model_variant, cuda.Device(0).name(), precision)
+        if plan_path.exists():
+            plan = plan_path.read_bytes()
+        elif onnx_path.exists():
+            plan = build_engine(onnx_path, plan_path, precision, model_variant)
+        else:
+            raise RuntimeError(f"Pose landmark ONNX model not found at: {onnx_path}")
+        
+        logger = trt.Logger(trt.Logger.WARNING)
+        self._engine = trt.Runtime(logger).deserialize_cuda_engine(plan)
+        self._context = self._engine.create_execution_context()
+        self._stream = cuda.Stream()
+        
+        # Pinned host + device buffer per I/O tensor, sized for the largest batch
+        self._inputs = []
+        self._outputs = []
+        for i in range(self._engine.num_io_tensors):
+            name = self._engine.get_tensor_name(i)
+            shape = tuple(self._engine.get_tensor_shape(name))
+            if shape[0] == -1:
+                shape = (POSE_TRT_MAX_BATCH,) + shape[1:]
+            dtype = trt.nptype(self._engine.get_tensor_dtype(name))
+            host = cuda.pagelocked_empty(trt.volume(shape), dtype).reshape(shape)
+            device = cuda.mem_alloc(host.nbytes)
+            self._context.set_tensor_address(name, int(device))
+            
+            if self._engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT:
+                self._inputs.append((name, host, device))
+            else:
+                self._outputs.append((name, host, device))
+        
+        input_name, input_host, _ = self._inputs[0]
+        self._dynamic_batch = tuple(self._engine.get_tensor_shape(input_name))[0] == -1
+        self.max_batch = input_host.shape[0]
+        self._nchw = input_host.shape[1] == 3
+        self._input_size = input_host.shape[2] if not self._nchw else input_host.shape[3]
+    
+    def _letterbox(self, rgb: np.ndarray, slot: int):
+        """Pad-and-resize the ROI into batch slot `slot` of the square input, scaled to [0, 1]."""
+        return fill_input(self._inputs[0][1][slot], rgb, self._input_size, self._nchw)
+    
+    def _infer(self, batch: int):
+        """Run the engine on the first `batch` slots of the input buffers."""
+        cuda = self._cuda
+        if self._dynamic_batch:
+            for name, host, _ in self._inputs:
+                self._context.set_input_shape(name, (batch,) + host.shape[1:])
+        
+        for _, host, device in self._inputs:
+            cuda.memcpy_htod_async(device, host[:batch], self._stream)
+        self._context.execute_async_v3(self._stream.handle)
+        for _, host, device in self._outputs:
+            cuda.memcpy_dtoh_async(host[:batch], device, self._stream)
+        self._stream.synchronize()
+    
+    def _decode(self, slot: int, placement) -> PoseLandmarkResult:
+        return decode_landmarks([host[slot] for _, host, _ in self._outputs], placement, self._input_size)
+    
+    def detect_batch(self, rgb_images: List[np.ndarray]) -> List[PoseLandmarkResult]:
+        """
+        Run the landmark network on several RGB ROIs.
+        
+        Images are submitted max_batch at a time (1 for engines with a fixed
+        batch of one), amortizing launch and transfer overhead.
+        """
+        results = []
+        for start in range(0, len(rgb_images), self.max_batch):
+            chunk = rgb_images[start:start + self.max_batch]
+            letterboxes = [self._letterbox(rgb, slot) for slot, rgb in enumerate(chunk)]
+            self._infer(len(chunk))
+            results.extend(self._decode(slot, lb) for slot, lb in enumerate(letterboxes))
+        return results
+    
+    def detect(self, image) -> PoseLandmarkResult:
+        return self.detect_batch([image.numpy_view()])[0]
+    
+    def detect_for_video(self, image, timestamp_ms: int) -> PoseLandmarkResult:
+        return self.detect(image)
+    
+    def finish_clip(self):
+        """No temporal state is kept between frames, so nothing to reset."""
+    
+    def close(self):
+        self._context = None
+        self._engine = None
@@ -142,7 +142,8 @@ def expand_box(
         padding_ratio: How much to expand (0.2 = 20% on each side)
         
     Returns:
-        Expanded bounding box dict
+        Expanded bounding box dict, always at least 1x1 and inside the frame
+        (so a crop with it is never empty)
     """
     x, y, w, h = box["x"], box["y"], box["w"], box["h"]
     
@@ -151,9 +152,9 @@ def expand_box(
     pad_h = int(h * padding_ratio)
     
     # Expand box
-    new_x = max(0, x - pad_w)
-    new_y = max(0, y - pad_h)
-    new_w = min(frame_width - new_x, w + 2 * pad_w)
-    new_h = min(frame_height - new_y, h + 2 * pad_h)
+    new_x = min(max(0, x - pad_w), frame_width - 1)
+    new_y = min(max(0, y - pad_h), frame_height - 1)
+    new_w = max(1, min(frame_width - new_x, w + 2 * pad_w))
+    new_h = max(1, min(frame_height - new_y, h + 2 * pad_h))
     
     return {"x": new_x, "y": new_y, "w": new_w, "h": new_h}
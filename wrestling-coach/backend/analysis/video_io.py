@@ -0,0 +1,551 @@
+"""
+Video I/O Module for Wrestling Coach
+Decodes video with PyAV (hardware accelerated when available) behind a
+cv2.VideoCapture-compatible interface, falling back to OpenCV.
+"""
+
+import os
+import queue
+import threading
+from fractions import Fraction
+from typing import Callable, Iterator, Optional, Tuple
+import cv2
+import numpy as np
+
+try:
+    import av
+except ImportError:  # PyAV is optional; OpenCV decode is used without it
+    av = None
+
+
+# Hardware decoders to try, in order of preference
+HWACCEL_DEVICE_TYPES = ("cuda", "videotoolbox", "vaapi", "d3d11va")
+
+# Software decode threads per video (~2 is the sweet spot for H.264; more
+# threads mostly add frame-threading latency and contend with pose inference)
+DECODE_THREADS = 2
+
+# H.264 encoders to try, in order of preference (hardware first, then x264)
+H264_ENCODERS = ("h264_nvenc", "h264_videotoolbox", "h264_qsv", "libx264")
+
+# Encoder options per codec
+ENCODER_OPTIONS = {
+    "libx264": {"preset": "veryfast"},
+}
+
+# Encoder input pixel format per codec (default yuv420p)
+ENCODER_PIX_FMTS = {
+    "h264_qsv": "nv12",
+}
+
+# Longest side of the annotated output video (0 keeps the source size).
+# Frames are downscaled on the writer thread, after the overlay is drawn.
+OUTPUT_MAX_SIDE = int(os.environ.get("WRESTLEAI_OUTPUT_MAX_SIDE", "1280"))
+
+# Decoded frames buffered ahead of the analysis loop by prefetch_frames
+FRAME_QUEUE_SIZE = 4
+
+# Annotated frames buffered for the background encoder thread
+WRITER_QUEUE_SIZE = 8
+
+_END_OF_STREAM = object()
+
+
+def _make_hwaccel():
+    """Build a PyAV HWAccel config for the first usable device type, or None."""
+    try:
+        from av.codec.hwaccel import HWAccel, hwdevices_available
+    except ImportError:
+        return None
+    
+    available = set(hwdevices_available())
+    for device_type in HWACCEL_DEVICE_TYPES:
+        if device_type in available:
+            return HWAccel(device_type=device_type, allow_software_fallback=True)
+    return None
+
+
+class PyAVCapture:
+    """
+    Minimal cv2.VideoCapture replacement backed by PyAV.
+    
+    Supports the subset of the VideoCapture API used by the analysis code:
+    isOpened(), read(), grab()/retrieve(), get(), set() for frame/millisecond
+    seeking, and release().
+    Frames are returned as BGR uint8 arrays, same as OpenCV.
+    """
+    
+    def __init__(self, path: str, hwaccel: bool = True):
+        options = {}
+        if hwaccel:
+            hw = _make_hwaccel()
+            if hw is not None:
+                options["hwaccel"] = hw
+        
+        self._container = av.open(path, **options)
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        self._stream.thread_count = DECODE_THREADS
+        
+        rate = self._stream.average_rate or self._stream.guessed_rate
+        self._fps = float(rate) if rate else 0.0
+        self._width = self._stream.codec_context.width
+        self._height = self._stream.codec_context.height
+        self._time_base = float(self._stream.time_base)
+        self._start_pts = self._stream.start_time or 0
+        
+        if self._stream.frames:
+            self._frame_count = int(self._stream.frames)
+        elif self._stream.duration is not None and self._fps > 0:
+            self._frame_count = int(self._stream.duration * self._time_base * self._fps)
+        else:
+            self._frame_count = 0
+        
+        self._frames = self._container.decode(self._stream)
+        self._pending = None
+        self._grabbed = None
+        self._pos = 0
+        self._opened = True
+    
+    def isOpened(self) -> bool:
+        return self._opened
+    
+    def _frame_index(self, frame) -> int:
+        if frame.pts is None or self._fps <= 0:
+            return self._pos
+        return int(round((frame.pts - self._start_pts) * self._time_base * self._fps))
+    
+    def _next_frame(self):
+        if self._pending is not None:
+            frame, self._pending = self._pending, None
+            return frame
+        return next(self._frames, None)
+    
+    def grab(self) -> bool:
+        """Decode the next frame without converting it (see retrieve())."""
+        if not self._opened:
+            return False
+        
+        self._grabbed = self._next_frame()
+        if self._grabbed is None:
+            return False
+        
+        self._pos += 1
+        return True
+    
+    def retrieve(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Convert the last grabbed frame to a BGR array."""
+        if self._grabbed is None:
+            return False, None
+        return True, self._grabbed.to_ndarray(format="bgr24")
+    
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+    
+    def _seek_frame(self, target_idx: int) -> bool:
+        """Seek to the keyframe before target_idx, then decode forward to it."""
+        target_idx = max(0, int(target_idx))
+        target_pts = self._start_pts + int(target_idx / self._fps / self._time_base) if self._fps > 0 else self._start_pts
+        
+        self._container.seek(target_pts, stream=self._stream, backward=True, any_frame=False)
+        self._frames = self._container.decode(self._stream)
+        self._pending = None
+        self._grabbed = None
+        
+        while True:
+            frame = next(self._frames, None)
+            if frame is None:
+                self._pos = target_idx
+                return False
+            if self._frame_index(frame) >= target_idx:
+                self._pending = frame
+                self._pos = target_idx
+                return True
+    
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return self._seek_frame(int(value))
+        if prop_id == cv2.CAP_PROP_POS_MSEC:
+            return self._seek_frame(int(round(value / 1000.0 * self._fps)))
+        return False
+    
+    def get(self, prop_id: int) -> float:
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self._fps
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self._width)
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self._height)
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self._frame_count)
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return float(self._pos)
+        return 0.0
+    
+    def release(self):
+        if self._opened:
+            self._container.close()
+            self._opened = False
+
+
+def open_video(path: str, hwaccel: bool = True):
+    """
+    Open a video for decoding.
+    
+    Uses PyAV with hardware decoding (NVDEC, VideoToolbox, VAAPI...) when PyAV
+    is installed, otherwise a cv2.VideoCapture (also hardware accelerated when
+    OpenCV's FFmpeg build supports it). Callers should check isOpened()
+    exactly as with OpenCV.
+    
+    Args:
+        path: Path to the video file
+        hwaccel: Whether to try hardware-accelerated decoding
+    
+    Returns:
+        PyAVCapture or cv2.VideoCapture
+    """
+    if av is not None:
+        try:
+            return PyAVCapture(path, hwaccel=hwaccel)
+        except Exception:
+            # Unsupported container/codec for PyAV - let OpenCV try
+            pass
+    return _open_cv2_capture(path, hwaccel)
+
+
+def _open_cv2_capture(path: str, hwaccel: bool = True):
+    """
+    Open a cv2.VideoCapture, asking OpenCV's FFmpeg backend for hardware
+    decoding (VAAPI, D3D11, ...) when requested and for DECODE_THREADS
+    software decode threads, falling back to a plain capture if that
+    can't be opened.
+    """
+    # Open-time decode thread count (OpenCV 4.6+, FFmpeg backend only)
+    thread_params = []
+    if hasattr(cv2, "CAP_PROP_N_THREADS"):
+        thread_params = [cv2.CAP_PROP_N_THREADS, DECODE_THREADS]
+    
+    if hwaccel and hasattr(cv2, "CAP_PROP_HW_ACCELERATION"):
+        try:
+            cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                cv2.CAP_PROP_HW_DEVICE, 0,
+            ] + thread_params)
+            if cap.isOpened():
+                return cap
+            cap.release()
+        except cv2.error:
+            pass
+    
+    if thread_params:
+        try:
+            cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG, thread_params)
+            if cap.isOpened():
+                return cap
+            cap.release()
+        except cv2.error:
+            pass
+    return cv2.VideoCapture(path)
+
+
+def _pick_encoder(width: int, height: int, rate: Fraction) -> Optional[str]:
+    """
+    Return the first H.264 encoder that actually opens on this host.
+    
+    Hardware encoders can be compiled into FFmpeg without a usable device,
+    so each candidate is opened once with the real frame size to be sure.
+    """
+    for name in H264_ENCODERS:
+        try:
+            ctx = av.CodecContext.create(name, "w")
+            ctx.width = width
+            ctx.height = height
+            ctx.pix_fmt = ENCODER_PIX_FMTS.get(name, "yuv420p")
+            ctx.time_base = 1 / rate
+            ctx.options = dict(ENCODER_OPTIONS.get(name, {}))
+            ctx.open()
+            return name
+        except Exception:
+            continue
+    return None
+
+
+class PyAVWriter:
+    """
+    Minimal cv2.VideoWriter replacement that encodes H.264 with PyAV.
+    
+    Accepts BGR uint8 frames via write(), same as OpenCV.
+    """
+    
+    def __init__(self, path: str, codec: str, fps: float, width: int, height: int):
+        rate = Fraction(fps).limit_denominator(1001)
+        
+        self._container = av.open(path, mode="w")
+        self._stream = self._container.add_stream(codec, rate=rate)
+        self._stream.width = width
+        self._stream.height = height
+        self._stream.pix_fmt = ENCODER_PIX_FMTS.get(codec, "yuv420p")
+        self._stream.options = dict(ENCODER_OPTIONS.get(codec, {}))
+        self._opened = True
+    
+    def isOpened(self) -> bool:
+        return self._opened
+    
+    def write(self, frame: np.ndarray):
+        av_frame = av.VideoFrame.from_ndarray(frame, format="bgr24")
+        for packet in self._stream.encode(av_frame):
+            self._container.mux(packet)
+    
+    def release(self):
+        if self._opened:
+            # Flush buffered frames from the encoder
+            for packet in self._stream.encode(None):
+                self._container.mux(packet)
+            self._container.close()
+            self._opened = False
+
+
+class NullVideoWriter:
+    """Writer stand-in that discards frames, for analyses that don't need the overlay video."""
+    
+    def isOpened(self) -> bool:
+        return True
+    
+    def write(self, frame: np.ndarray):
+        pass
+    
+    def release(self):
+        pass
+
+
+class ResizingVideoWriter:
+    """Downscales frames to a fixed size before passing them to another writer."""
+    
+    def __init__(self, writer, width: int, height: int):
+        self._writer = writer
+        self._size = (width, height)
+    
+    def isOpened(self) -> bool:
+        return self._writer.isOpened()
+    
+    def write(self, frame: np.ndarray):
+        self._writer.write(cv2.resize(frame, self._size, interpolation=cv2.INTER_AREA))
+    
+    def release(self):
+        self._writer.release()
+
+
+def output_size(width: int, height: int, max_side: int = OUTPUT_MAX_SIDE) -> Tuple[int, int]:
+    """Output video size: (width, height) scaled so the longest side fits max_side, kept even."""
+    if max_side <= 0 or max(width, height) <= max_side:
+        return width, height
+    scale = max_side / max(width, height)
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+class BackgroundVideoWriter:
+    """
+    Runs another writer's write() calls on a background thread.
+    
+    Encoding (PyAV or OpenCV, both release the GIL) then overlaps with pose
+    inference on the analysis thread; a bounded queue applies back-pressure.
+    Frames must not be modified after being passed to write().
+    Encoder errors are re-raised from the next write() or release().
+    """
+    
+    def __init__(self, writer, queue_size: int = WRITER_QUEUE_SIZE):
+        self._writer = writer
+        self._frames: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            if self._error is not None:
+                continue  # Drain so the producer never blocks
+            try:
+                self._writer.write(frame)
+            except BaseException as e:
+                self._error = e
+    
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+    
+    def isOpened(self) -> bool:
+        return self._writer.isOpened()
+    
+    def write(self, frame: np.ndarray):
+        self._raise_error()
+        self._frames.put(frame)
+    
+    def release(self):
+        if self._thread.is_alive():
+            self._frames.put(None)
+            self._thread.join()
+        self._writer.release()
+        self._raise_error()
+
+
+def open_video_writer(
+    path: str,
+    fps: float,
+    width: int,
+    height: int,
+    threaded: bool = True,
+    max_side: int = OUTPUT_MAX_SIDE
+):
+    """
+    Open an annotated-video writer.
+    
+    Prefers a hardware H.264 encoder (NVENC, VideoToolbox, Quick Sync) through PyAV, then
+    libx264, and falls back to OpenCV's mp4v writer when PyAV is unavailable.
+    Callers should check isOpened() exactly as with OpenCV.
+    
+    Args:
+        path: Output .mp4 path
+        fps: Output frame rate
+        width: Frame width in pixels
+        height: Frame height in pixels
+        threaded: Encode on a background thread (BackgroundVideoWriter)
+        max_side: Downscale frames so the longest side fits (0 = source size)
+    
+    Returns:
+        PyAVWriter or cv2.VideoWriter, wrapped in a ResizingVideoWriter when
+        downscaling and a BackgroundVideoWriter if threaded
+    """
+    frame_size = (width, height)
+    width, height = output_size(width, height, max_side)
+    writer = None
+    
+    # yuv420p needs even dimensions
+    if av is not None and width % 2 == 0 and height % 2 == 0:
+        try:
+            codec = _pick_encoder(width, height, Fraction(fps).limit_denominator(1001))
+            if codec is not None:
+                writer = PyAVWriter(path, codec, fps, width, height)
+        except Exception:
+            pass
+    
+    if writer is None:
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        writer = cv2.VideoWriter(path, fourcc, fps, (width, height))
+    
+    if (width, height) != frame_size:
+        writer = ResizingVideoWriter(writer, width, height)
+    
+    # Resizing (if any) runs on the writer thread too
+    if threaded and writer.isOpened():
+        return BackgroundVideoWriter(writer)
+    return writer
+
+
+def release_all(*resources, raise_errors: bool = True):
+    """
+    Release each capture/writer in order, even if an earlier release fails.
+    
+    The first release error is re-raised at the end when raise_errors is set;
+    pass False while another exception is propagating so it isn't masked.
+    """
+    first_error = None
+    for resource in resources:
+        try:
+            resource.release()
+        except Exception as e:
+            if first_error is None:
+                first_error = e
+    if raise_errors and first_error is not None:
+        raise first_error
+
+
+def seek_frame(cap, frame_idx: int):
+    """
+    Position a capture at frame_idx.
+    
+    Skips the seek when the capture is already there (e.g. consecutive
+    segments), since a seek re-decodes from the previous keyframe.
+    """
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != frame_idx:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+
+
+def prefetch_frames(
+    cap,
+    max_frames: int,
+    prepare: Optional[Callable[[int, np.ndarray], object]] = None,
+    queue_size: int = FRAME_QUEUE_SIZE,
+    first_frame: Optional[np.ndarray] = None
+) -> Iterator[Tuple[int, np.ndarray, object]]:
+    """
+    Decode frames on a background thread and yield them in order.
+    
+    Decoding (and any per-frame work in `prepare`, such as tracker updates)
+    overlaps with pose inference on the calling thread. OpenCV and PyAV
+    release the GIL while decoding, so the two stages run concurrently.
+    
+    Args:
+        cap: Opened capture (PyAVCapture or cv2.VideoCapture)
+        max_frames: Stop after this many frames
+        prepare: Optional callable (frame_idx, frame) -> extra, run on the reader thread
+        queue_size: Maximum number of frames decoded ahead
+        first_frame: Frame already read from `cap`, yielded as frame 0 so the
+            caller doesn't have to seek back to re-decode it
+    
+    Yields:
+        (frame_idx, frame, extra) tuples, frame_idx starting at 0
+    
+    Exceptions raised on the reader thread are re-raised in the caller.
+    """
+    frames: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        # Block while the queue is full, but give up once the consumer stops
+        while not stop.is_set():
+            try:
+                frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def reader():
+        try:
+            frame_idx = 0
+            pending = first_frame
+            while frame_idx < max_frames:
+                if pending is not None:
+                    frame, pending = pending, None
+                else:
+                    ret, frame = cap.read()
+                    if not ret:
+                        break
+                extra = prepare(frame_idx, frame) if prepare is not None else None
+                if not put((frame_idx, frame, extra)):
+                    return
+                frame_idx += 1
+            put(_END_OF_STREAM)
+        except BaseException as e:
+            put(e)
+    
+    thread = threading.Thread(target=reader, name="frame-reader", daemon=True)
+    thread.start()
+    
+    try:
+        while True:
+            item = frames.get()
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
@@ -0,0 +1,101 @@
+"""
+Worker Pool Module for Wrestling Coach
+Runs video analyses in persistent worker processes with pre-warmed models.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+# Number of analysis worker processes (each holds its own YOLO + pose models)
+ANALYSIS_WORKERS = max(1, min(2, (os.cpu_count() or 2) // 2))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _init_worker():
+    """
+    Warm the models once per worker process so analyses don't pay load time.
+    
+    Loads the YOLO model (including its warm-up inference) and builds the
+    reusable lite pose landmarker, which downloads the model file if needed
+    and initializes the MediaPipe runtime, plus the IMAGE-mode landmarker the
+    up-front pose check uses. Analyses run on the worker's main thread, so the
+    first one uses this graph; each clip's finish_clip() then prepares a
+    fresh graph for the next. The Numba metrics kernel is compiled here too.
+    
+    Warm-up is best-effort: an initializer that raises marks the whole pool
+    broken, so failures are only logged and the analysis that needs the model
+    raises its own error (e.g. the pose model download instructions).
+    """
+    from .detection import get_yolo_model
+    from .pose_analyze import get_image_pose_landmarker, get_pose_landmarker, warm_frame_metrics_kernel
+    
+    for name, warm in (
+        ("YOLO model", get_yolo_model),
+        ("pose landmarker", functools.partial(get_pose_landmarker, "lite")),
+        ("pose check landmarker", functools.partial(get_image_pose_landmarker, "lite")),
+        ("metrics kernel", warm_frame_metrics_kernel),
+    ):
+        try:
+            warm()
+        except Exception as e:
+            print(f"Worker warm-up of {name} failed: {e}")
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """
+    Get or create the shared analysis process pool.
+    
+    Uses the "spawn" start method: MediaPipe, PyTorch and the YOLO preload
+    thread are not fork-safe.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=ANALYSIS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _executor
+
+
+async def run_in_pool(func: Callable, *args, **kwargs):
+    """
+    Run a module-level analysis function in the worker pool and await its result.
+    
+    Exceptions raised in the worker (e.g. ValueError) are re-raised here. If
+    a worker process died, the broken pool is dropped so the next call starts
+    a fresh one, and a RuntimeError is raised for this call.
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    try:
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    except BrokenProcessPool as e:
+        with _executor_lock:
+            if _executor is executor:
+                _executor = None
+        executor.shutdown(wait=False)
+        raise RuntimeError(f"Analysis worker process terminated unexpectedly; the worker pool will be restarted: {e}") from e
+
+
+def shutdown_pool():
+    """Shut down the worker pool if it was started."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            if sys.version_info >= (3, 9):
+                _executor.shutdown(wait=False, cancel_futures=True)
+            else:  # cancel_futures is new in 3.9
+                _executor.shutdown(wait=False)
+            _executor = None
@@ -15,6 +15,7 @@ import json
 import os
 import subprocess
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
@@ -27,7 +28,8 @@ import numpy as np
 from pydantic import BaseModel
 
 from analysis.pose_analyze import analyze_video, analyze_video_with_anchors
-from analysis.detection import detect_persons, auto_select_target
+from analysis.detection import Detections, detect_persons, auto_select_target, start_yolo_preload
+from analysis.worker_pool import run_in_pool, shutdown_pool
 
 # Setup logging
 logging.basicConfig(
@@ -167,6 +169,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def preload_models():
+    """Warm the YOLO model used by /api/boxes while the server starts."""
+    start_yolo_preload()
+
+
+@app.on_event("shutdown")
+def stop_analysis_workers():
+    """Stop the analysis worker processes with the server."""
+    shutdown_pool()
+
+
 # Ensure upload and output directories exist
 BASE_DIR = Path(__file__).resolve().parent
 UPLOADS_DIR = BASE_DIR / "uploads"
@@ -229,6 +243,8 @@ class AnalyzeRequest(BaseModel):
     continuation: Optional[bool] = False
     clip_index: Optional[int] = None
     prior_context: Optional[PriorContext] = None
+    # Skip drawing/encoding the overlay video when the client doesn't show it
+    annotated_video: bool = True
 
 
 class AnalyzeWithAnchorsRequest(BaseModel):
@@ -237,6 +253,7 @@ class AnalyzeWithAnchorsRequest(BaseModel):
     continuation: bool = False
     prior_context: Optional[dict] = None
     skill_level: Optional[str] = "intermediate"  # beginner, intermediate, advanced
+    annotated_video: bool = True
 
 
 class TrimRequest(BaseModel):
@@ -359,8 +376,27 @@ def generate_anchor_timestamps(duration: float) -> list:
     return result
 
 
+# Number of videos whose metadata is kept by get_video_metadata
+VIDEO_METADATA_CACHE_SIZE = 128
+
+
 def get_video_metadata(video_path: str) -> dict:
-    """Extract video metadata using cv2."""
+    """
+    Extract video metadata using cv2.
+    
+    Cached per file version (path, size, mtime): most endpoints need the
+    upload's metadata, and every open re-parses the container header
+    (the moov atom for MP4/MOV).
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        raise ValueError(f"Could not open video: {video_path}")
+    return dict(_probe_video_metadata(video_path, stat.st_size, stat.st_mtime_ns))
+
+
+@lru_cache(maxsize=VIDEO_METADATA_CACHE_SIZE)
+def _probe_video_metadata(video_path: str, size: int, mtime_ns: int) -> dict:
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise ValueError(f"Could not open video: {video_path}")
@@ -828,13 +864,13 @@ async def get_boxes(
     except Exception as e:
         # Detection failure shouldn't be a hard error
         logger.warning(f"Person detection failed: {str(e)}")
-        detections = []
+        detections = Detections.empty()
     
     # Also compute auto-selected target
     auto_target = auto_select_target(detections, width, height)
     
     return {
-        "boxes": detections,
+        "boxes": detections.to_json(),
         "auto_target": auto_target,
         "frame_width": width,
         "frame_height": height,
@@ -926,6 +962,7 @@ async def analyze(job_id: str, request: AnalyzeRequest):
         request: JSON body with:
             - target_box: {x, y, w, h} or null for auto-selection
             - t_start: Start timestamp in seconds (default 0)
+            - annotated_video: Optional bool, false skips the overlay video (default true)
     
     Returns:
         job_id: Same job ID
@@ -988,14 +1025,16 @@ async def analyze(job_id: str, request: AnalyzeRequest):
     # Run pose analysis with target tracking (write to temp path)
     output_ready = False
     try:
-        result = analyze_video(
+        result = await run_in_pool(
+            analyze_video,
             str(input_path), 
             str(temp_output_path),  # Write to temp path first
             target_box=parsed_target,
             t_start=t_start,
             continuation=request.continuation or False,
             clip_index=request.clip_index,
-            prior_context=parsed_prior_context
+            prior_context=parsed_prior_context,
+            emit_video=request.annotated_video
         )
         
         # Atomic rename: only after VideoWriter.release() and file has content
@@ -1003,7 +1042,7 @@ async def analyze(job_id: str, request: AnalyzeRequest):
             os.replace(str(temp_output_path), str(final_output_path))
             output_ready = True
             logger.info(f"Atomically renamed output for job {job_id}")
-        else:
+        elif request.annotated_video:
             logger.warning(f"Temp output file missing or empty for job {job_id}")
             
     except ValueError as e:
@@ -1183,6 +1222,7 @@ async def analyze_with_anchors(job_id: str, request: AnalyzeWithAnchorsRequest):
             - continuation: Optional bool for continuing prior analysis
             - prior_context: Optional object with prior analysis context
             - skill_level: Optional skill level for rating calculation
+            - annotated_video: Optional bool, false skips the overlay video (default true)
     
     Returns:
         job_id: Same job ID
@@ -1283,13 +1323,15 @@ async def analyze_with_anchors(job_id: str, request: AnalyzeWithAnchorsRequest):
     # Run anchor-based analysis (write to temp path)
     output_ready = False
     try:
-        result = analyze_video_with_anchors(
+        result = await run_in_pool(
+            analyze_video_with_anchors,
             str(input_path),
             str(temp_output_path),  # Write to temp path first
             anchors=anchors_list,
             skill_level=skill_level,
             trim_start=trim_start,
-            trim_end=trim_end
+            trim_end=trim_end,
+            emit_video=request.annotated_video
         )
         
         # Atomic rename: only after VideoWriter.release() and file has content
@@ -1297,7 +1339,7 @@ async def analyze_with_anchors(job_id: str, request: AnalyzeWithAnchorsRequest):
             os.replace(str(temp_output_path), str(final_output_path))
             output_ready = True
             logger.info(f"Atomically renamed output for job {job_id}")
-        else:
+        elif request.annotated_video:
             logger.warning(f"Temp output file missing or empty for job {job_id}")
             
     except ValueError as e: